@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import Dict, List
 
 
 class Settings(BaseSettings):
@@ -25,9 +25,101 @@ class Settings(BaseSettings):
     LOG_LEVEL: str = "INFO"
     LOG_DIR: str = "logs"
 
+    # Ingest
+    INGEST_CHUNK_ROWS: int = 50_000
+    INGEST_CSV_BLOCK_BYTES: int = 16 * 1024 * 1024
+    SCORING_CHUNK_ROWS: int = 5_000
+    EXCEL_SHEET_WORKERS: int = 0  # 0 = one per CPU core
+    UPLOAD_SPOOL_THRESHOLD_MB: int = 1
+    MAX_UPLOAD_MB: int = 512
+    DOMAINS: List[str] = ["health", "infrastructure", "public_safety"]
+    MAX_UPLOAD_MB_BY_DOMAIN: Dict[str, int] = {
+        "health": 512,
+        "infrastructure": 512,
+        "public_safety": 256
+    }
+
+    # Background ingest jobs
+    STORAGE_DIR: str = "storage"
+    INGEST_JOB_DB_PATH: str = "storage/ingest_jobs.db"
+    INGEST_UPLOAD_DIR: str = "storage/uploads"
+    INGEST_WORKERS: int = 2
+    INGEST_QUEUE_SIZE: int = 32
+    INGEST_JOB_EVENTS_INTERVAL_SECONDS: float = 1.0
+    UPLOAD_SESSION_DIR: str = "storage/upload_sessions"
+    UPLOAD_SESSION_TTL_HOURS: float = 24.0  # idle sessions are deleted after this
+    UPLOAD_SESSION_SWEEP_SECONDS: float = 3600.0
+    INGEST_LEDGER_PATH: str = "storage/ingest_ledger.db"
+    INGEST_LEDGER_LOOKUP_BATCH: int = 10_000
+
+    # Data-quality profiles
+    PROFILE_DIR: str = "storage/profiles"
+    PROFILE_TOP_CATEGORIES: int = 10
+    PROFILE_MAX_TRACKED_CATEGORIES: int = 1000
+
+    # Dashboard statistics
+    DASHBOARD_STATS_PATH: str = "storage/dashboard_stats.json"
+    DASHBOARD_STATS_PERSIST_SECONDS: float = 30.0
+    DASHBOARD_STATS_RETENTION_DAYS: int = 30
+
+    # Dashboard HTTP caching (ETag revalidation after max-age)
+    HTTP_CACHE_MAX_AGE_SECONDS: int = 5
+
+    # Dashboard SSE stream
+    DASHBOARD_STREAM_POLL_SECONDS: float = 1.0
+    DASHBOARD_STREAM_HEARTBEAT_SECONDS: float = 15.0
+    DASHBOARD_STREAM_QUEUE_SIZE: int = 32
+    DASHBOARD_STREAM_MAX_CLIENTS: int = 2000
+    DASHBOARD_STREAM_RETRY_MS: int = 3000
+
+    # Crisis alert board
+    ALERT_BOARD_REFRESH_SECONDS: float = 300.0
+    ALERT_BOARD_MAX_ALERTS: int = 50
+    ALERT_BOARD_DOMAIN: str = "infrastructure"
+    ALERT_BOARD_SERVICE_TYPE: str = "Water_Supply_Shortage"
+    ALERT_BOARD_SEED_PATH: str = "../data/raw/maharashtra_infrastructure_data.csv"
+
+    # Ranked priority issues
+    PRIORITY_ISSUES_PATH: str = "../models/priority_engine/priority_ranked_issues.csv"
+    PRIORITY_ISSUES_RELOAD_CHECK_SECONDS: float = 30.0
+    PRIORITY_ISSUES_MAX_LIMIT: int = 500
+
+    # Live priority queue
+    PRIORITY_QUEUE_PATH: str = "storage/priority_queue.json"
+    PRIORITY_QUEUE_PERSIST_SECONDS: float = 30.0
+    PRIORITY_QUEUE_MAX_K: int = 100
+    PRIORITY_QUEUE_MAX_ISSUES: int = 10_000  # lowest-scored evicted past this
+
+    # Bundled department history per domain
+    DOMAIN_DATA_PATHS: Dict[str, str] = {
+        "health": "../data/raw/maharashtra_health_data.csv",
+        "infrastructure": "../data/raw/maharashtra_infrastructure_data.csv",
+        "public_safety": "../data/raw/maharashtra_public_safety_data.csv"
+    }
+
+    # Trend rollups (seeded from DOMAIN_DATA_PATHS when the warehouse is empty)
+    TREND_ROLLUPS_PATH: str = "storage/trend_rollups.json"
+    TREND_ROLLUPS_PERSIST_SECONDS: float = 30.0
+
+    # Warehouse
+    WAREHOUSE_BACKEND: str = "parquet"
+    WAREHOUSE_PATH: str = "storage/warehouse"
+    WAREHOUSE_ROW_GROUP_SIZE: int = 128 * 1024
+    WAREHOUSE_QUERY_MAX_ROWS: int = 10_000
+
     # Privacy
     ENABLE_DATA_ANONYMIZATION: bool = True
     ENABLE_AUDIT_LOGGING: bool = True
+    AUDIT_LOG_PATH: str = "logs/data_access_audit.jsonl"
+    AUDIT_FLUSH_INTERVAL_SECONDS: float = 1.0
+    AUDIT_MAX_BATCH: int = 1000
+    PII_HASH_CACHE_SIZE: int = 50_000  # entries per process (~10 MB)
+    PII_HASH_CACHE_MAX_KEY_CHARS: int = 256  # longer values are hashed uncached
+    ANONYMIZATION_PLAN_CACHE_SIZE: int = 1024
+    ANONYMIZATION_WORKERS: int = 0  # 0 = one per CPU core
+    ANONYMIZATION_CHUNK_ROWS: int = 10_000  # frames above this go to the pool
+    PII_SCAN_ENABLED: bool = True
+    PII_SCAN_SAMPLE_ROWS: int = 2_000  # non-null values sampled per column
 
     class Config:
         env_file = ".env"
@@ -1,10 +1,25 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.formparsers import MultiPartParser
 from config.settings import settings
-from routes import health, predictions, dashboard
+from routes import health, predictions, dashboard, priority
 from services.model_loader import model_loader
+from services.ingest_jobs import ingest_jobs
+from services.ingest_service import shutdown_sheet_pool
+from services.dashboard_stats import dashboard_stats
+from services.alert_board import alert_board
+from services.dashboard_stream import dashboard_broadcaster
+from services.priority_issues import priority_issues
+from services.priority_queue import priority_queue
+from services.trend_rollups import trend_rollups
+from services.upload_sessions import upload_sessions
+from middleware.data_privacy import privacy_framework
+from middleware.upload_limits import UploadSizeLimitMiddleware
 from utils.logger import logger
 
+# Multipart file parts are spooled to disk above this size
+MultiPartParser.max_file_size = settings.UPLOAD_SPOOL_THRESHOLD_MB * 1024 * 1024
+
 # Create FastAPI app
 app = FastAPI(
     title=settings.APP_NAME,
@@ -14,6 +29,12 @@ app = FastAPI(
     redoc_url="/redoc"
 )
 
+# Upload size limits (inside CORS so 413 responses carry CORS headers)
+app.add_middleware(
+    UploadSizeLimitMiddleware,
+    path_prefix=f"{settings.API_PREFIX}/dashboard/upload"
+)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -37,6 +58,17 @@ async def startup_event():
         logger.logger.info("System ready to serve predictions")
     else:
         logger.logger.error("System startup failed - check model paths")
+    ingest_jobs.start()
+    dashboard_stats.start()
+    priority_queue.start()
+    trend_rollups.start()
+    alert_board.start()
+    dashboard_broadcaster.start()
+    upload_sessions.start()
+    try:
+        priority_issues.load()
+    except FileNotFoundError:
+        logger.logger.warning("Ranked priority issues not found; /priority/issues unavailable")
     logger.logger.info("="*60)
 
 # Shutdown event
@@ -47,11 +79,21 @@ async def shutdown_event():
     """Cleanup on shutdown"""
     logger.logger.info(
         "Shutting down PredictivMinds Maharashtra Governance AI API")
+    ingest_jobs.shutdown()
+    await dashboard_broadcaster.shutdown()
+    await upload_sessions.shutdown()
+    alert_board.shutdown()
+    shutdown_sheet_pool()
+    dashboard_stats.shutdown()
+    priority_queue.shutdown()
+    trend_rollups.shutdown()
+    privacy_framework.shutdown()
 
 # Include routers
 app.include_router(health.router)
 app.include_router(predictions.router, prefix=settings.API_PREFIX)
 app.include_router(dashboard.router, prefix=settings.API_PREFIX)
+app.include_router(priority.router, prefix=settings.API_PREFIX)
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,103 @@
+"""
+Free-text PII scanner
+Finds phone, Aadhaar, PAN and email values hidden in string columns under
+arbitrary headers (remarks, address lines, notes) and masks them. Patterns
+run through Arrow compute kernels (RE2) over whole columns, so there is no
+per-cell Python regex loop on the ingest path.
+"""
+
+from typing import Dict, Iterable, List, Tuple
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from config.settings import settings
+
+
+# Ordered: Aadhaar (12 digits) before phone (10 digits) so a masked
+# Aadhaar number cannot be partly re-matched as a phone number
+PII_PATTERNS: Dict[str, str] = {
+    'email': r'[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}',
+    'aadhaar': r'\b[2-9][0-9]{3}[ -]?[0-9]{4}[ -]?[0-9]{4}\b',
+    'pan': r'\b[A-Z]{5}[0-9]{4}[A-Z]\b',
+    'phone': r'(?:\+91[ -]?)?\b[6-9][0-9]{9}\b',
+}
+
+
+class PIIScanner:
+    """
+    Detects PII in string columns from a sample, then masks whole columns
+    Detection looks at up to sample_rows non-null values per column; a
+    column flagged once stays flagged for the rest of the upload
+    """
+
+    def __init__(self, patterns: Dict[str, str] = None, sample_rows: int = None):
+        self.patterns = dict(patterns or PII_PATTERNS)
+        self.sample_rows = sample_rows or settings.PII_SCAN_SAMPLE_ROWS
+        self.combined = '|'.join(f'(?:{p})' for p in self.patterns.values())
+
+    def detect(self, df: pd.DataFrame, skip: Iterable[str] = ()) -> Dict[str, List[str]]:
+        """Map column -> PII types found in a sample of its values"""
+        skip = set(skip)
+        findings = {}
+
+        for name in df.columns:
+            if name in skip or not self._is_text(df[name]):
+                continue
+
+            values = df[name].dropna()
+            if len(values) > self.sample_rows:
+                step = len(values) // self.sample_rows
+                values = values.iloc[::step][:self.sample_rows]
+
+            sample = self._to_arrow(values)
+            if not pc.any(
+                    pc.match_substring_regex(sample, self.combined)).as_py():
+                continue
+
+            findings[name] = [
+                kind for kind, pattern in self.patterns.items()
+                if pc.any(pc.match_substring_regex(sample, pattern)).as_py()]
+
+        return findings
+
+    def mask(self, df: pd.DataFrame,
+             findings: Dict[str, List[str]]) -> Tuple[pd.DataFrame, Dict[str, int]]:
+        """Replace PII matches in flagged columns with [TYPE] tokens"""
+        masked = df.copy(deep=False)
+        cells_masked = {}
+
+        for name, kinds in findings.items():
+            if name not in masked.columns:
+                continue
+            column = self._to_arrow(masked[name])
+            hit = pc.fill_null(pc.match_substring_regex(column, self.combined), False)
+            cells_masked[name] = pc.sum(hit).as_py() or 0
+            for kind in kinds:
+                column = pc.replace_substring_regex(
+                    column, self.patterns[kind], f'[{kind.upper()}]')
+
+            # Untouched cells keep their original value (and type)
+            original = masked[name].to_numpy(dtype=object, copy=True)
+            original[hit.to_numpy(zero_copy_only=False)] = \
+                column.filter(hit).to_numpy(zero_copy_only=False)
+            masked[name] = pd.Series(original, index=masked.index, name=name)
+
+        return masked, cells_masked
+
+    @staticmethod
+    def _is_text(column: pd.Series) -> bool:
+        return (pd.api.types.is_object_dtype(column)
+                or pd.api.types.is_string_dtype(column))
+
+    @staticmethod
+    def _to_arrow(values: pd.Series):
+        """String view of a column for the compute kernels"""
+        try:
+            return pa.array(values, type=pa.string(), from_pandas=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            # Mixed object column (e.g. numbers and text): compare as text
+            return pa.array(values.where(values.isna(), values.astype(str)),
+                            type=pa.string(), from_pandas=True)
+
+
+pii_scanner = PIIScanner()
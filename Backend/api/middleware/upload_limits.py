@@ -0,0 +1,73 @@
+from urllib.parse import parse_qs
+from fastapi import HTTPException
+from starlette.responses import JSONResponse
+from config.settings import settings
+
+
+def upload_limit_bytes(domain: str) -> int:
+    """Maximum accepted upload size for a domain, in bytes"""
+    limit_mb = settings.MAX_UPLOAD_MB_BY_DOMAIN.get(
+        domain.lower(), settings.MAX_UPLOAD_MB)
+    return limit_mb * 1024 * 1024
+
+
+class UploadSizeLimitMiddleware:
+    """
+    Enforce per-domain upload size limits before the body is read
+    Requests that declare an oversized Content-Length are rejected with 413
+    without touching the body; chunked bodies are counted as they stream
+    and aborted as soon as they cross the limit
+    """
+
+    def __init__(self, app, path_prefix: str):
+        self.app = app
+        self.path_prefix = path_prefix
+
+    async def __call__(self, scope, receive, send):
+        if (scope["type"] != "http" or scope["method"] != "POST"
+                or not scope["path"].startswith(self.path_prefix)):
+            await self.app(scope, receive, send)
+            return
+
+        query = parse_qs(scope.get("query_string", b"").decode())
+        domain = query.get("domain", ["health"])[0]
+        limit = upload_limit_bytes(domain)
+
+        headers = dict(scope["headers"])
+        content_length = headers.get(b"content-length")
+        if content_length is not None:
+            try:
+                declared = int(content_length)
+            except ValueError:
+                declared = -1
+            if declared < 0:
+                response = JSONResponse(
+                    status_code=400,
+                    content={"detail": "Invalid Content-Length header"})
+                await response(scope, receive, send)
+                return
+            if declared > limit:
+                response = JSONResponse(
+                    status_code=413,
+                    content={"detail": self._detail(domain, limit)})
+                await response(scope, receive, send)
+                return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    raise HTTPException(
+                        status_code=413, detail=self._detail(domain, limit))
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+    @staticmethod
+    def _detail(domain: str, limit: int) -> str:
+        return (f"Upload exceeds the {limit // (1024 * 1024)} MB limit "
+                f"for domain '{domain}'")
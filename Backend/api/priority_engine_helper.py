@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 
 
@@ -121,3 +122,63 @@ class PriorityScoringEngine:
             'resource_availability': resource,
             'citizen_sentiment': sentiment
         }
+
+    def score_frame(self, df, domain):
+        """
+        Vectorized calculate_priority_for_issue over a DataFrame of issues
+        domain is a scalar or a per-row Series; returns the same components
+        """
+        domain = pd.Series(domain, index=df.index) if np.isscalar(domain) \
+            else domain
+        health = (domain == 'Health').to_numpy()
+        infra = (domain == 'Infrastructure').to_numpy()
+        requests = df['requests'].to_numpy(dtype=float)
+        denominator = requests + 1
+
+        # Urgency
+        severity = df['severity_level'].to_numpy()
+        urgency = np.select(
+            [health, infra],
+            [7 + 2 * (requests > 80) + 1 * (df['response_time_minutes'].to_numpy() > 30),
+             5 + 3 * (df['pending_requests'].to_numpy() / denominator > 0.5)
+             + 2 * (df['is_monsoon'].to_numpy() == 1)],
+            default=np.select([severity == 'Critical', severity == 'High'], [10, 9],
+                              default=8))
+        urgency = np.minimum(10, urgency)
+
+        # Impact
+        affected = requests * df['population_factor'].to_numpy(dtype=float) * 100
+        impact = np.select(
+            [affected > 50000, affected > 20000, affected > 10000, affected > 5000],
+            [10, 8, 6, 4], default=2)
+
+        # Resource availability
+        health_ratio = df['resource_availability'].to_numpy() / denominator
+        infra_ratio = df['resolved_requests'].to_numpy() / denominator
+        safety_ratio = df['incidents_resolved'].to_numpy() / denominator
+        resource = np.select(
+            [health, infra],
+            [np.select([health_ratio > 0.9, health_ratio > 0.7], [9, 6], default=3),
+             np.select([infra_ratio > 0.8, infra_ratio > 0.5], [8, 5], default=2)],
+            default=np.select([safety_ratio > 0.9, safety_ratio > 0.7], [9, 6], default=3))
+
+        # Citizen sentiment
+        complaints = df['complaints'].to_numpy()
+        sentiment = np.select(
+            [complaints > 10, complaints > 7, complaints > 5, complaints > 3],
+            [10, 8, 6, 4], default=2)
+
+        priority_score = (
+            urgency * self.weights['urgency'] +
+            impact * self.weights['impact'] +
+            resource * self.weights['resource_availability'] +
+            sentiment * self.weights['citizen_sentiment']
+        )
+
+        return pd.DataFrame({
+            'priority_score': np.round(priority_score, 2),
+            'urgency': urgency,
+            'impact': impact,
+            'resource_availability': resource,
+            'citizen_sentiment': sentiment
+        }, index=df.index)
@@ -1,149 +1,577 @@
-from fastapi import APIRouter, Request, UploadFile, File, HTTPException
-from typing import List
-import pandas as pd
+from fastapi import APIRouter, Request, Response, UploadFile, File, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+from typing import Any, Dict, List, Optional
+from pathlib import Path
+from datetime import date
+import asyncio
 import io
+import json
+import shutil
+import tempfile
+import pandas as pd
+from config.settings import settings
 from utils.logger import logger
-from middleware.data_privacy import privacy_framework
+from utils.http_cache import cached_response
+from middleware.upload_limits import upload_limit_bytes
+from services.ingest_service import IngestService
+from services.ingest_jobs import ingest_jobs, TERMINAL_STATES
+from services.warehouse import warehouse, check_domain
+from services.batch_scoring_service import BatchScoringService
+from services.upload_sessions import (
+    upload_sessions, UploadChecksumMismatch, UploadOffsetMismatch)
+from services.data_profiler import profile_store
+from services.dashboard_stream import dashboard_broadcaster
+from services.trend_rollups import trend_rollups
+from services.history_store import history_store
+from services.dashboard_snapshots import (
+    SUMMARY_SECTIONS, alerts_payload, privacy_report_payload,
+    statistics_payload, summary_payload)
 
 router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
 
 
+def _parse_sheets(sheets: Optional[str]) -> Optional[List[str]]:
+    """Comma-separated worksheet names from a query parameter"""
+    if not sheets:
+        return None
+    return [name.strip() for name in sheets.split(',') if name.strip()] or None
+
+
+def _check_domain(domain: str) -> str:
+    """Known domain name, lowercased; anything else is a 400"""
+    try:
+        return check_domain(domain)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @router.get("/alerts")
 async def get_critical_alerts(request: Request):
-    """Get all critical alerts"""
+    """
+    Get all critical alerts
+    Served from the precomputed alert board; the scheduler rescores wards
+    in the background, so a poll never runs the models. Unchanged boards
+    revalidate with a 304 via ETag
+    """
     logger.log_api_request("/api/v1/dashboard/alerts",
                            "GET", {}, request.client.host)
 
-    # Mock data
-    alerts = [
-        {
-            "id": 1,
-            "type": "water_shortage",
-            "district": "Nagpur",
-            "ward": "Ward_5",
-            "probability": 0.87,
-            "days_until": 3,
-            "affected_population": 15000,
-            "priority_score": 9.2,
-            "status": "CRITICAL"
-        },
-        {
-            "id": 2,
-            "type": "hospital_overflow",
-            "district": "Mumbai",
-            "ward": "Ward_12",
-            "probability": 0.78,
-            "days_until": 5,
-            "affected_population": 50000,
-            "priority_score": 8.7,
-            "status": "HIGH"
-        },
-        {
-            "id": 3,
-            "type": "road_collapse_risk",
-            "district": "Pune",
-            "ward": "Ward_8",
-            "probability": 0.65,
-            "days_until": 10,
-            "affected_population": 8000,
-            "priority_score": 7.5,
-            "status": "MEDIUM"
-        }
-    ]
-
-    return {
-        "success": True,
-        "alerts": alerts,
-        "total_count": len(alerts),
-        "timestamp": pd.Timestamp.now().isoformat()
-    }
+    return cached_response(request, alerts_payload())
 
 
 @router.get("/statistics")
 async def get_statistics(request: Request):
-    """Get overall system statistics"""
+    """Get overall system statistics (live counters, O(1) to serve)"""
     logger.log_api_request("/api/v1/dashboard/statistics",
                            "GET", {}, request.client.host)
 
-    return {
-        "success": True,
-        "statistics": {
-            "total_predictions_today": 156,
-            "critical_alerts": 3,
-            "districts_monitored": 8,
-            "average_response_time_hours": 4.2,
-            "citizen_satisfaction_rate": 0.87,
-            "models_active": 3,
-            "data_sources_integrated": 3
-        },
-        "timestamp": pd.Timestamp.now().isoformat()
-    }
+    return cached_response(request, statistics_payload())
+
 
+@router.get("/summary")
+async def get_dashboard_summary(request: Request, fields: Optional[str] = None):
+    """
+    Statistics, alerts, health and privacy report in one round trip
+    fields selects sections (comma-separated, default all); each section
+    holds its endpoint's content (e.g. the statistics object itself), with
+    success reported once at the top level
+    """
+    logger.log_api_request("/api/v1/dashboard/summary",
+                           "GET", {"fields": fields}, request.client.host)
+
+    sections = [name.strip() for name in fields.split(",") if name.strip()] \
+        if fields else list(SUMMARY_SECTIONS)
+    unknown = [name for name in sections if name not in SUMMARY_SECTIONS]
+    if unknown or not sections:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown summary fields: {unknown}; "
+                   f"choose from {list(SUMMARY_SECTIONS)}")
+
+    # Duplicates dropped, order kept
+    return cached_response(request, summary_payload(list(dict.fromkeys(sections))))
+
+
+@router.get("/stream")
+async def stream_dashboard(request: Request):
+    """
+    Server-sent events replacing alert/statistics polling
+    Sends a 'snapshot' event on connect, then 'alerts' and 'statistics'
+    delta events whenever the published snapshots change
+    """
+    logger.log_api_request("/api/v1/dashboard/stream",
+                           "GET", {}, request.client.host)
+
+    try:
+        subscriber = dashboard_broadcaster.subscribe()
+    except OverflowError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+    async def events():
+        try:
+            async for frame in dashboard_broadcaster.frames(subscriber):
+                yield frame
+        finally:
+            dashboard_broadcaster.unsubscribe(subscriber)
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache",
+                                      "X-Accel-Buffering": "no"})
 
+
+@router.post("/upload")
 @router.post("/upload/excel")
 async def upload_excel_data(
     request: Request,
+    response: Response,
     file: UploadFile = File(...),
-    domain: str = "health"
+    domain: str = "health",
+    background: bool = False,
+    sheets: Optional[str] = None
 ):
     """
-    Upload Excel file for multi-domain data integration
+    Upload a department data file for multi-domain data integration
+    Accepts Excel, CSV, Parquet and Arrow; the format is detected from
+    the file contents and name. Every worksheet of a workbook is ingested
+    (or a comma-separated `sheets` subset), tagged with source_sheet.
+    With background=true the file is queued and a job ID is returned
+    immediately (poll /dashboard/jobs/{id})
     Solves: "siloed data assets" problem from challenge
     """
-    logger.log_api_request("/api/v1/dashboard/upload/excel", "POST",
+    logger.log_api_request(request.url.path, "POST",
                            {"filename": file.filename, "domain": domain},
                            request.client.host)
+    domain = _check_domain(domain)
 
     try:
-        # Read Excel file
-        contents = await file.read()
-        df = pd.read_excel(io.BytesIO(contents))
-
         # Log file upload
         logger.log_file_upload(
             filename=file.filename,
-            file_size=len(contents),
+            file_size=file.size or 0,
             domain=domain,
             ip=request.client.host
         )
 
-        # Anonymize uploaded data
-        anonymized_records = []
-        for _, row in df.iterrows():
-            anonymized_row = privacy_framework.anonymize_data(row.to_dict())
-            anonymized_records.append(anonymized_row)
+        file_format = IngestService.detect_format(file.file, file.filename)
+        sheet_names = _parse_sheets(sheets)
 
-        # Furthure: Upload to BigQuery
-        # from google.cloud import bigquery
-        # client = bigquery.Client()
-        # table_id = f""
-        # client.load_table_from_dataframe(df, table_id)
+        # Large loads: hand off to the background ingest workers
+        if background:
+            job = await run_in_threadpool(
+                ingest_jobs.submit, file.file, file.filename, file_format, domain,
+                sheet_names)
+            response.status_code = 202
+            return {
+                "success": True,
+                "message": f"File queued for ingest: {file.filename}",
+                "job_id": job["job_id"],
+                "status": job["status"],
+                "status_url": f"{settings.API_PREFIX}/dashboard/jobs/{job['job_id']}",
+                "domain": domain,
+                "file_format": file_format,
+                "timestamp": pd.Timestamp.now().isoformat()
+            }
+
+        # Stream the file in row chunks; new/changed rows in each chunk are
+        # anonymized and appended to the warehouse (off the event loop)
+        summary = await run_in_threadpool(
+            IngestService.ingest_upload,
+            file.file, file_format, domain, file.filename, sheets=sheet_names)
 
         return {
             "success": True,
             "message": f"File uploaded successfully: {file.filename}",
-            "records_processed": len(df),
+            "records_processed": summary["records_processed"],
+            "rows_skipped": summary["rows_skipped"],
+            "duplicate_file": summary["duplicate_file"],
             "domain": domain,
-            "columns_detected": list(df.columns),
+            "file_format": file_format,
+            "columns_detected": summary["columns_detected"],
+            "pii_masked": summary["pii_masked"],
+            "profile": summary["profile"],
             "data_anonymized": True,
             "timestamp": pd.Timestamp.now().isoformat()
         }
 
+    except OverflowError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
-        logger.log_error(e, "Excel upload failed")
+        logger.log_error(e, "File upload failed")
         raise HTTPException(status_code=400, detail=f"Upload failed: {str(e)}")
 
 
-@router.get("/privacy-report")
-async def get_privacy_report(request: Request):
-    """Get privacy compliance report"""
-    logger.log_api_request(
-        "/api/v1/dashboard/privacy-report", "GET", {}, request.client.host)
+@router.post("/upload/score")
+async def score_uploaded_file(
+    request: Request,
+    file: UploadFile = File(...),
+    domain: str = "health",
+    format: str = "ndjson"
+):
+    """
+    Score every row of an uploaded file with the demand, crisis and
+    priority models and stream the results back as NDJSON (or CSV)
+    Each model runs when the file has (or lets us derive) its input columns
+    """
+    logger.log_api_request("/api/v1/dashboard/upload/score", "POST",
+                           {"filename": file.filename, "domain": domain},
+                           request.client.host)
+
+    domain = _check_domain(domain)
+    if format not in ("ndjson", "csv"):
+        raise HTTPException(status_code=400, detail="format must be 'ndjson' or 'csv'")
+
+    # FastAPI closes the UploadFile before a streamed body is sent, so the
+    # response reads from its own copy, closed once the stream ends
+    source = tempfile.TemporaryFile()
+    await run_in_threadpool(shutil.copyfileobj, file.file, source, 1024 * 1024)
+    source.seek(0)
+
+    try:
+        file_format = IngestService.detect_format(source, file.filename)
+        chunks = IngestService.iter_chunks(
+            source, file_format, settings.SCORING_CHUNK_ROWS)
+
+        # Parse the first chunk up front so unusable files fail with a 400
+        first = await run_in_threadpool(next, chunks, None)
+        if first is not None:
+            columns = BatchScoringService.prepare(first.head(0))[0].columns
+            if not BatchScoringService.models_for(columns):
+                raise ValueError(
+                    "No model can score this file; expected the columns of "
+                    "DemandForecastRequest, CrisisPredictionRequest or PriorityScoreRequest")
+    except Exception as e:
+        source.close()
+        logger.log_error(e, "Batch scoring failed")
+        raise HTTPException(status_code=400, detail=f"Scoring failed: {str(e)}")
+
+    def scored_chunks():
+        try:
+            if first is not None:
+                yield first
+                yield from chunks
+        finally:
+            source.close()
+
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        BatchScoringService.stream(scored_chunks(), domain, format),
+        media_type=media_type,
+        background=BackgroundTask(source.close))
+
+
+@router.post("/upload/sessions")
+async def create_upload_session(
+    request: Request,
+    filename: str,
+    domain: str = "health",
+    total_bytes: Optional[int] = None
+):
+    """
+    Start a resumable chunked upload
+    Send the file with PUT /upload/sessions/{id}?offset=N (raw bytes),
+    resume from the returned offset after failures, then commit
+    """
+    logger.log_api_request("/api/v1/dashboard/upload/sessions", "POST",
+                           {"filename": filename, "domain": domain},
+                           request.client.host)
+
+    domain = _check_domain(domain)
+    limit = upload_limit_bytes(domain)
+    if total_bytes is not None and total_bytes > limit:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Upload exceeds the {limit // (1024 * 1024)} MB limit for domain '{domain}'")
+
+    session = await run_in_threadpool(
+        upload_sessions.create, domain, filename, total_bytes)
+    return {"success": True, "session": session}
+
+
+@router.get("/upload/sessions/{session_id}")
+async def get_upload_session(request: Request, session_id: str):
+    """Get the acknowledged offset of a chunked upload"""
+    logger.log_api_request(f"/api/v1/dashboard/upload/sessions/{session_id}",
+                           "GET", {}, request.client.host)
+
+    session = upload_sessions.get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail=f"Unknown upload session: {session_id}")
+    return {"success": True, "session": session}
+
 
-    report = privacy_framework.generate_privacy_report()
+@router.put("/upload/sessions/{session_id}")
+async def append_upload_chunk(request: Request, session_id: str, offset: int):
+    """Append the raw request body to an upload session at offset"""
+    logger.log_api_request(f"/api/v1/dashboard/upload/sessions/{session_id}",
+                           "PUT", {"offset": offset}, request.client.host)
+
+    session = upload_sessions.get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail=f"Unknown upload session: {session_id}")
+
+    try:
+        session = await upload_sessions.append(
+            session_id, offset, request.stream(),
+            upload_limit_bytes(session["domain"]))
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Unknown upload session: {session_id}")
+    except UploadOffsetMismatch as e:
+        raise HTTPException(
+            status_code=409,
+            detail={"message": "Offset mismatch, resume from expected offset",
+                    "expected_offset": e.expected})
+    except OverflowError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+    return {"success": True, "session": session}
+
+
+@router.post("/upload/sessions/{session_id}/commit")
+async def commit_upload_session(
+    request: Request,
+    session_id: str,
+    sha256: Optional[str] = None,
+    sheets: Optional[str] = None
+):
+    """
+    Finish a chunked upload and queue it as a background ingest job
+    Ingest checkpoints every committed chunk, so a crash resumes there
+    """
+    logger.log_api_request(f"/api/v1/dashboard/upload/sessions/{session_id}/commit",
+                           "POST", {}, request.client.host)
+
+    session = upload_sessions.get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail=f"Unknown upload session: {session_id}")
+
+    def submit(data_path: Path, job_id: str) -> Dict[str, Any]:
+        # A retried commit may find the data already moved into the job
+        # queue; the extension is then the only format hint left
+        with (open(data_path, 'rb') if data_path.exists() else io.BytesIO()) as f:
+            file_format = IngestService.detect_format(f, session["filename"])
+        return ingest_jobs.submit_file(
+            str(data_path), session["filename"], file_format,
+            session["domain"], _parse_sheets(sheets), job_id=job_id)
+
+    try:
+        session, job = await upload_sessions.commit(session_id, submit, sha256)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Unknown upload session: {session_id}")
+    except UploadOffsetMismatch as e:
+        raise HTTPException(
+            status_code=409,
+            detail={"message": "Upload incomplete", "expected_offset": e.expected})
+    except UploadChecksumMismatch as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except OverflowError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+    if job is None:
+        return {"success": True, "session": session, "job_id": session["job_id"]}
+    return {
+        "success": True,
+        "session": session,
+        "job_id": job["job_id"],
+        "status_url": f"{settings.API_PREFIX}/dashboard/jobs/{job['job_id']}"
+    }
+
+
+@router.get("/jobs/{job_id}")
+async def get_ingest_job(request: Request, job_id: str):
+    """Get progress and results of a background ingest job"""
+    logger.log_api_request(f"/api/v1/dashboard/jobs/{job_id}",
+                           "GET", {}, request.client.host)
+
+    job = await run_in_threadpool(ingest_jobs.status, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+
+    return {
+        "success": True,
+        "job": job,
+        "timestamp": pd.Timestamp.now().isoformat()
+    }
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_ingest_job(request: Request, job_id: str):
+    """Server-sent events with job progress until the job finishes"""
+    logger.log_api_request(f"/api/v1/dashboard/jobs/{job_id}/events",
+                           "GET", {}, request.client.host)
+
+    if await run_in_threadpool(ingest_jobs.status, job_id) is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+
+    async def events():
+        last = None
+        while not await request.is_disconnected():
+            job = await run_in_threadpool(ingest_jobs.status, job_id)
+            if job != last:
+                yield f"data: {json.dumps(job)}\n\n"
+                last = job
+            if job["status"] in TERMINAL_STATES:
+                break
+            await asyncio.sleep(settings.INGEST_JOB_EVENTS_INTERVAL_SECONDS)
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+@router.get("/data/{domain}")
+async def query_domain_data(
+    request: Request,
+    domain: str,
+    columns: Optional[str] = None,
+    district: Optional[str] = None,
+    ward: Optional[str] = None,
+    service_type: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    limit: int = 1000
+):
+    """
+    Query ingested (anonymized) data from the warehouse
+    Filters are pushed down into the columnar scan; start_date/end_date
+    select ingest-date partitions
+    """
+    logger.log_api_request(f"/api/v1/dashboard/data/{domain}",
+                           "GET", {}, request.client.host)
+    domain = _check_domain(domain)
+
+    filters = {name: value for name, value in
+               [("district", district), ("ward", ward), ("service_type", service_type)]
+               if value is not None}
+    selected = [c.strip() for c in columns.split(",")] if columns else None
+    limit = max(0, min(limit, settings.WAREHOUSE_QUERY_MAX_ROWS))
+
+    try:
+        df = await run_in_threadpool(
+            warehouse.read, domain, columns=selected, filters=filters,
+            start_date=start_date, end_date=end_date, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
     return {
         "success": True,
-        "privacy_report": report,
+        "domain": domain,
+        "records": json.loads(df.to_json(orient="records", date_format="iso")),
+        "total_count": len(df),
         "timestamp": pd.Timestamp.now().isoformat()
     }
+
+
+@router.get("/history/{domain}")
+async def query_domain_history(
+    request: Request,
+    domain: str,
+    district: str,
+    service_type: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    columns: Optional[str] = None,
+    limit: int = 1000
+):
+    """
+    Bundled department history for a district, by service type and date
+    Served from the compact history store: a lookup is a binary search on
+    its sorted layout plus a slice, not a scan of the raw data
+    """
+    logger.log_api_request(f"/api/v1/dashboard/history/{domain}", "GET",
+                           {"district": district, "service_type": service_type},
+                           request.client.host)
+    domain = _check_domain(domain)
+
+    try:
+        history = await run_in_threadpool(history_store.get, domain)
+    except (KeyError, FileNotFoundError):
+        raise HTTPException(status_code=404, detail=f"No history for domain: {domain}")
+
+    selected = [c.strip() for c in columns.split(",")] if columns else None
+    unknown = [c for c in selected or [] if c not in history.columns]
+    if unknown:
+        raise HTTPException(status_code=400,
+                            detail=f"Unknown columns for {domain}: {unknown}")
+    limit = max(0, min(limit, settings.WAREHOUSE_QUERY_MAX_ROWS))
+
+    df = history.lookup(district, service_type, start_date, end_date,
+                        columns=selected, limit=limit)
+    # float32 columns print as their shortest repr, not float64 noise
+    floats = df.columns[df.dtypes == 'float32']
+    df[floats] = df[floats].astype(str).astype('float64')
+    return {
+        "success": True,
+        "domain": domain,
+        "records": json.loads(df.to_json(orient="records", date_format="iso")),
+        "total_count": len(df),
+        "timestamp": pd.Timestamp.now().isoformat()
+    }
+
+
+@router.get("/trends")
+async def get_demand_trends(
+    request: Request,
+    granularity: str = "day",
+    domain: Optional[str] = None,
+    district: Optional[str] = None,
+    service_type: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None
+):
+    """
+    Demand per day, week or month for a domain/district/service type
+    Read from the materialized rollups (omitted filters mean all values),
+    so the cost depends on the periods returned, not the history stored
+    """
+    logger.log_api_request("/api/v1/dashboard/trends", "GET",
+                           {"granularity": granularity, "domain": domain,
+                            "district": district, "service_type": service_type},
+                           request.client.host)
+    if domain is not None:
+        domain = _check_domain(domain)
+
+    try:
+        points = trend_rollups.query(granularity, domain, district, service_type,
+                                     start_date, end_date)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return {
+        "success": True,
+        "granularity": granularity,
+        "domain": domain,
+        "district": district,
+        "service_type": service_type,
+        "points": points,
+        "count": len(points),
+        "timestamp": pd.Timestamp.now().isoformat()
+    }
+
+
+@router.get("/profiles/{domain}")
+async def get_latest_profile(request: Request, domain: str):
+    """Get the data-quality profile of the latest upload for a domain"""
+    logger.log_api_request(f"/api/v1/dashboard/profiles/{domain}",
+                           "GET", {}, request.client.host)
+    domain = _check_domain(domain)
+
+    profile = await run_in_threadpool(profile_store.latest, domain)
+    if profile is None:
+        raise HTTPException(status_code=404, detail=f"No profile for domain: {domain}")
+
+    return {
+        "success": True,
+        "profile": profile,
+        "timestamp": pd.Timestamp.now().isoformat()
+    }
+
+
+@router.get("/privacy-report")
+async def get_privacy_report(request: Request):
+    """Get privacy compliance report"""
+    logger.log_api_request(
+        "/api/v1/dashboard/privacy-report", "GET", {}, request.client.host)
+
+    return cached_response(request, privacy_report_payload())
@@ -1,9 +1,11 @@
+import time
 from fastapi import APIRouter, HTTPException, Request
 from models.requests import DemandForecastRequest, CrisisPredictionRequest, PriorityScoreRequest
 from models.responses import DemandForecastResponse, CrisisPredictionResponse, PriorityScoreResponse
 from services.demand_service import DemandForecastingService
 from services.crisis_service import CrisisPredictionService
 from services.priority_service import PriorityService
+from services.dashboard_stats import dashboard_stats
 from utils.logger import logger
 
 router = APIRouter(prefix="/predict", tags=["Predictions"])
@@ -18,8 +20,13 @@ async def predict_demand(request: Request, payload: DemandForecastRequest):
     logger.log_api_request("/api/v1/predict/demand",
                            "POST", payload.dict(), request.client.host)
 
+    started = time.perf_counter()
     try:
-        return DemandForecastingService.predict(payload, request.client.host)
+        result = DemandForecastingService.predict(payload, request.client.host)
+        dashboard_stats.record_prediction(
+            "demand_forecasting", payload.district,
+            (time.perf_counter() - started) * 1000)
+        return result
     except Exception as e:
         logger.log_error(e, "Demand prediction failed")
         raise HTTPException(status_code=400, detail=str(e))
@@ -34,8 +41,14 @@ async def predict_crisis(request: Request, payload: CrisisPredictionRequest):
     logger.log_api_request("/api/v1/predict/crisis",
                            "POST", payload.dict(), request.client.host)
 
+    started = time.perf_counter()
     try:
-        return CrisisPredictionService.predict(payload, request.client.host)
+        result = CrisisPredictionService.predict(payload, request.client.host)
+        dashboard_stats.record_prediction(
+            "crisis_prediction", payload.district,
+            (time.perf_counter() - started) * 1000,
+            alert_level=result.prediction.alert_level)
+        return result
     except Exception as e:
         logger.log_error(e, "Crisis prediction failed")
         raise HTTPException(status_code=400, detail=str(e))
@@ -50,8 +63,13 @@ async def calculate_priority(request: Request, payload: PriorityScoreRequest):
     logger.log_api_request("/api/v1/calculate/priority",
                            "POST", payload.dict(), request.client.host)
 
+    started = time.perf_counter()
     try:
-        return PriorityService.calculate(payload, request.client.host)
+        result = PriorityService.calculate(payload, request.client.host)
+        dashboard_stats.record_prediction(
+            "priority_scoring", payload.district,
+            (time.perf_counter() - started) * 1000)
+        return result
     except Exception as e:
         logger.log_error(e, "Priority calculation failed")
         raise HTTPException(status_code=400, detail=str(e))
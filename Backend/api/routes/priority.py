@@ -0,0 +1,98 @@
+from datetime import date
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+import pandas as pd
+from config.settings import settings
+from services.priority_issues import priority_issues
+from services.priority_queue import priority_queue
+from utils.logger import logger
+
+router = APIRouter(prefix="/priority", tags=["Priority"])
+
+
+@router.get("/issues")
+async def query_priority_issues(
+    request: Request,
+    domain: Optional[str] = None,
+    district: Optional[str] = None,
+    issue_type: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    sort: str = "rank",
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    include_total: bool = False
+):
+    """
+    Ranked priority issues from the priority engine, filtered and paginated
+    sort is rank (default), timestamp or -timestamp; pass next_cursor back
+    as cursor for the following page
+    """
+    logger.log_api_request("/api/v1/priority/issues", "GET",
+                           {"domain": domain, "district": district,
+                            "issue_type": issue_type},
+                           request.client.host)
+
+    limit = max(1, min(limit, settings.PRIORITY_ISSUES_MAX_LIMIT))
+    filters = {"domain": domain, "district": district, "issue_type": issue_type}
+
+    try:
+        if priority_issues.reload_due():
+            # (Re)loading the index runs off the event loop
+            await run_in_threadpool(priority_issues.ensure_current)
+        page = priority_issues.query(filters, start_date, end_date, sort,
+                                     limit, cursor, include_total)
+    except FileNotFoundError:
+        raise HTTPException(status_code=503, detail="Ranked issues not available")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return {
+        "success": True,
+        **page,
+        "timestamp": pd.Timestamp.now().isoformat()
+    }
+
+
+@router.get("/top")
+async def top_priority_issues(
+    request: Request,
+    k: int = 10,
+    district: Optional[str] = None
+):
+    """
+    Current top-k scored issues, statewide or for one district
+    Kept live by every /predict/priority call; rescoring an issue replaces it
+    """
+    logger.log_api_request("/api/v1/priority/top", "GET",
+                           {"k": k, "district": district}, request.client.host)
+
+    k = max(1, min(k, settings.PRIORITY_QUEUE_MAX_K))
+    issues = priority_queue.top(k, district)
+
+    return {
+        "success": True,
+        "district": district,
+        "issues": issues,
+        "count": len(issues),
+        "live_issues": len(priority_queue),
+        "timestamp": pd.Timestamp.now().isoformat()
+    }
+
+
+@router.delete("/top/{issue_key}")
+async def resolve_priority_issue(request: Request, issue_key: str):
+    """Mark an issue resolved, removing it from the live ranking"""
+    logger.log_api_request(f"/api/v1/priority/top/{issue_key}", "DELETE",
+                           {}, request.client.host)
+
+    issue = priority_queue.resolve(issue_key)
+    if issue is None:
+        raise HTTPException(status_code=404, detail="Issue not in the live ranking")
+
+    return {
+        "success": True,
+        "resolved": issue,
+        "timestamp": pd.Timestamp.now().isoformat()
+    }
@@ -0,0 +1,199 @@
+import itertools
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+import pandas as pd
+from config.settings import settings
+from services.model_loader import model_loader
+from services.warehouse import warehouse
+from services.crisis_service import CrisisPredictionService
+from services.priority_service import PriorityService
+from utils.logger import logger
+from utils.http_cache import CachedPayload
+
+
+# Warehouse columns the crisis and priority models need
+SOURCE_COLUMNS = ['timestamp', 'district', 'ward', 'service_type', 'month',
+                  'is_monsoon', 'population_factor', 'demand_requests',
+                  'resolved_requests', 'pending_requests', 'citizen_complaints',
+                  'response_time_hours']
+
+KEY_COLUMNS = ('timestamp', 'district', 'ward', 'service_type')
+
+ALERT_LEVEL_RANK = {'CRITICAL': 0, 'HIGH': 1, 'MEDIUM': 2, 'LOW': 3}
+
+
+class AlertSnapshot(NamedTuple):
+    """
+    One published alert board; payload is the pre-serialized JSON response
+    critical_count covers every CRITICAL ward, including any beyond the
+    max_alerts that are listed
+    """
+    alerts: Tuple[Dict[str, Any], ...]
+    generated_at: Optional[str]
+    source_rows: int
+    critical_count: int
+    payload: CachedPayload
+
+
+class AlertBoard:
+    """
+    Precomputed crisis alert board
+    A background thread scores the latest reading of every district/ward
+    with the crisis model in one vectorized pass, ranks the alerts with the
+    priority engine and swaps in a new immutable snapshot. Readers only
+    fetch the current snapshot, so each dashboard poll is a reference read
+    """
+
+    def __init__(self, interval: float, max_alerts: int):
+        self.interval = interval
+        self.max_alerts = max_alerts
+        self._versions = itertools.count()
+        self._snapshot = self._build_snapshot((), None, 0, 0)
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def snapshot(self) -> AlertSnapshot:
+        return self._snapshot
+
+    def start(self):
+        """Build the first board and refresh it every interval seconds"""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._wake.set()
+            self._thread = threading.Thread(
+                target=self._run, name="alert-board", daemon=True)
+            self._thread.start()
+
+    def shutdown(self):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def request_refresh(self):
+        """Rebuild soon (e.g. after an ingest); bursts coalesce into one refresh"""
+        self._wake.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.log_error(e, "Alert board refresh failed")
+
+    def refresh(self) -> AlertSnapshot:
+        """Score the latest data and publish a new snapshot"""
+        if model_loader.crisis_model is None or model_loader.priority_engine is None:
+            return self._snapshot
+
+        readings = self._load_readings()
+        latest = self._latest_by_ward(readings)
+        alerts, critical_count = self._score(latest)
+
+        self._snapshot = self._build_snapshot(
+            tuple(alerts), datetime.now().isoformat(), len(readings), critical_count)
+        return self._snapshot
+
+    @staticmethod
+    def _load_readings() -> pd.DataFrame:
+        """Water-supply rows from the warehouse, or the bundled sample if empty"""
+        try:
+            readings = warehouse.read(
+                settings.ALERT_BOARD_DOMAIN, columns=SOURCE_COLUMNS,
+                filters={'service_type': settings.ALERT_BOARD_SERVICE_TYPE})
+        except ValueError:
+            # Domain data without the crisis model's columns
+            readings = pd.DataFrame(columns=SOURCE_COLUMNS)
+
+        if readings.empty and Path(settings.ALERT_BOARD_SEED_PATH).exists():
+            readings = pd.read_csv(settings.ALERT_BOARD_SEED_PATH,
+                                   usecols=SOURCE_COLUMNS)
+            readings = readings[readings['service_type'] ==
+                                settings.ALERT_BOARD_SERVICE_TYPE]
+
+        # Uploads with conflicting column types are read back as strings
+        numeric = [c for c in SOURCE_COLUMNS if c not in KEY_COLUMNS]
+        return readings.assign(**{column: pd.to_numeric(readings[column], errors='coerce')
+                                  for column in numeric})
+
+    @staticmethod
+    def _latest_by_ward(readings: pd.DataFrame) -> pd.DataFrame:
+        """Latest reading per district/ward with 7- and 30-reading demand lags"""
+        if readings.empty:
+            return readings
+
+        keys = ['district', 'ward']
+        readings = readings.assign(timestamp=pd.to_datetime(readings['timestamp'])) \
+            .sort_values(keys + ['timestamp'])
+        groups = readings.groupby(keys, sort=False)
+
+        latest = groups.tail(1).set_index(keys)
+        latest['demand_lag_7days'] = groups.tail(7).groupby(keys)['demand_requests'].mean()
+        latest['demand_lag_30days'] = groups.tail(30).groupby(keys)['demand_requests'].mean()
+        latest['resolution_rate'] = latest['resolved_requests'] / (latest['demand_requests'] + 1)
+        return latest.reset_index()
+
+    def _score(self, latest: pd.DataFrame) -> Tuple[list, int]:
+        """
+        Crisis probability per ward, ranked by alert level then priority
+        Returns the listed alerts and the number of CRITICAL wards
+        """
+        if latest.empty:
+            return [], 0
+
+        crisis = CrisisPredictionService.predict_frame(latest)
+        priority = PriorityService.calculate_frame(latest.assign(
+            requests=latest['demand_requests'],
+            complaints=latest['citizen_complaints'],
+            response_time=latest['response_time_hours']), 'Infrastructure')
+
+        board = pd.concat([latest, crisis, priority[['priority_score']]], axis=1)
+        board = board[board['crisis_alert_level'].isin(['CRITICAL', 'HIGH', 'MEDIUM'])]
+        critical_count = int((board['crisis_alert_level'] == 'CRITICAL').sum())
+        board = board.assign(level_rank=board['crisis_alert_level'].map(ALERT_LEVEL_RANK)) \
+            .sort_values(['level_rank', 'priority_score', 'crisis_probability'],
+                         ascending=[True, False, False]) \
+            .head(self.max_alerts)
+
+        affected = (board['demand_requests'] * board['population_factor'] * 100).astype(int)
+        alerts = [{
+            "id": rank,
+            "type": "water_shortage",
+            "district": row.district,
+            "ward": row.ward,
+            "probability": float(row.crisis_probability),
+            "days_until": 7 if row.crisis_predicted else None,
+            "affected_population": int(population),
+            "priority_score": float(row.priority_score),
+            "status": row.crisis_alert_level,
+            "as_of": row.timestamp.date().isoformat()
+        } for rank, (row, population) in enumerate(
+            zip(board.itertuples(index=False), affected), start=1)]
+        return alerts, critical_count
+
+    def _build_snapshot(self, alerts: tuple, generated_at: Optional[str],
+                        source_rows: int, critical_count: int) -> AlertSnapshot:
+        payload = CachedPayload.from_json(next(self._versions), {
+            "success": True,
+            "alerts": list(alerts),
+            "total_count": len(alerts),
+            "critical_count": critical_count,
+            "generated_at": generated_at,
+            "source_rows": source_rows,
+            "timestamp": generated_at or datetime.now().isoformat()
+        })
+        return AlertSnapshot(alerts, generated_at, source_rows, critical_count, payload)
+
+
+alert_board = AlertBoard(
+    interval=settings.ALERT_BOARD_REFRESH_SECONDS,
+    max_alerts=settings.ALERT_BOARD_MAX_ALERTS)
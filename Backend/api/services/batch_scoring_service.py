@@ -0,0 +1,223 @@
+import json
+import pandas as pd
+from typing import Iterator, List, Optional, Tuple
+from models.requests import DemandForecastRequest, CrisisPredictionRequest, PriorityScoreRequest
+from services.demand_service import DemandForecastingService
+from services.crisis_service import CrisisPredictionService
+from services.priority_service import PriorityService
+from services.dashboard_stats import dashboard_stats
+from utils.logger import logger
+
+
+# Department export headers that mean the same thing as a request field
+COLUMN_ALIASES = {
+    'requests': ['demand_requests', 'incidents_reported'],
+    'complaints': ['citizen_complaints'],
+    'issue_type': ['service_type'],
+    'response_time': ['response_time_minutes', 'response_time_hours'],
+    'demand_requests': ['requests', 'incidents_reported'],
+    'citizen_complaints': ['complaints'],
+    'severity_level': ['severity'],
+}
+
+# Model features derived from raw export columns, as in training
+# (scripts/feature_engineering_and_training.py): rolling demand means per
+# (district, service_type) and per-request ratios over demand_requests + 1
+LAG_KEYS = ['district', 'service_type']
+LAG_WINDOWS = {'demand_lag_7days': 7, 'demand_lag_30days': 30}
+RATE_FEATURES = {
+    'resource_utilization_rate': ['resource_availability'],
+    'complaint_rate': ['citizen_complaints'],
+    'resolution_rate': ['resolved_requests', 'incidents_resolved'],
+}
+MONSOON_MONTHS = [6, 7, 8, 9]
+
+# Identifying columns echoed back with every scored row
+ID_COLUMNS = ['district', 'ward', 'service_type', 'issue_type', 'timestamp']
+
+_OPTIONAL_PRIORITY_FIELDS = {'complaints', 'resolution_rate', 'severity_level'}
+
+# Upload domain parameter -> priority engine domain
+PRIORITY_DOMAINS = {
+    'health': 'Health',
+    'infrastructure': 'Infrastructure',
+    'public_safety': 'PublicSafety',
+}
+
+
+def _required(schema, optional=()) -> List[str]:
+    return [name for name in schema.model_fields
+            if name not in optional and name != 'domain']
+
+
+class BatchScoringService:
+    """
+    Score uploaded ward rows with all three models in vectorized chunks
+    Each model runs on a chunk only if its input columns are present or
+    derivable; results are serialized per chunk so callers can stream them
+    """
+
+    DEMAND_COLUMNS = _required(DemandForecastRequest)
+    CRISIS_COLUMNS = _required(CrisisPredictionRequest)
+    PRIORITY_COLUMNS = _required(PriorityScoreRequest, _OPTIONAL_PRIORITY_FIELDS)
+
+    @staticmethod
+    def normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
+        """Lower-case/underscore headers and fill request fields from known aliases"""
+        df = df.rename(columns=lambda c: str(c).strip().lower()
+                       .replace(' ', '_').replace('-', '_'))
+        for target, candidates in COLUMN_ALIASES.items():
+            if target in df.columns:
+                continue
+            for candidate in candidates:
+                if candidate in df.columns:
+                    df[target] = df[candidate]
+                    break
+        return df
+
+    @staticmethod
+    def prepare(chunk: pd.DataFrame, lag_tail: Optional[pd.DataFrame] = None
+                ) -> Tuple[pd.DataFrame, Optional[pd.DataFrame]]:
+        """
+        Normalize headers and derive missing model features
+        Returns the frame and the demand history to pass with the next chunk:
+        demand lags roll over each group's rows in file order (exports are
+        chronological), continuing from lag_tail. Columns already in the
+        file are kept as is
+        """
+        df = BatchScoringService.normalize_columns(chunk)
+
+        if 'timestamp' in df.columns:
+            timestamp = pd.to_datetime(df['timestamp'], errors='coerce')
+            calendar = {'month': timestamp.dt.month,
+                        'day_of_week': timestamp.dt.dayofweek,
+                        'is_weekend': (timestamp.dt.dayofweek >= 5).astype(int).where(
+                            timestamp.notna())}
+            for name, values in calendar.items():
+                if name not in df.columns:
+                    df[name] = values
+        if 'is_monsoon' not in df.columns and 'month' in df.columns:
+            month = pd.to_numeric(df['month'], errors='coerce')
+            df['is_monsoon'] = month.isin(MONSOON_MONTHS).astype(int).where(month.notna())
+
+        if 'demand_requests' not in df.columns:
+            return df, lag_tail
+        demand = pd.to_numeric(df['demand_requests'], errors='coerce')
+        for name, numerators in RATE_FEATURES.items():
+            numerator = next((c for c in numerators if c in df.columns), None)
+            if name not in df.columns and numerator is not None:
+                df[name] = pd.to_numeric(df[numerator], errors='coerce') / (demand + 1)
+
+        missing = [name for name in LAG_WINDOWS if name not in df.columns]
+        if not missing or not set(LAG_KEYS) <= set(df.columns):
+            return df, lag_tail
+        history = pd.concat([lag_tail, df[LAG_KEYS].assign(demand_requests=demand)],
+                            ignore_index=True)
+        groups = history.groupby(LAG_KEYS, sort=False)['demand_requests']
+        for name in missing:
+            lags = groups.rolling(LAG_WINDOWS[name], min_periods=1).mean() \
+                .droplevel(list(range(len(LAG_KEYS)))).reindex(history.index)
+            df[name] = lags.iloc[len(history) - len(df):].to_numpy()
+        return df, history.groupby(LAG_KEYS, sort=False).tail(max(LAG_WINDOWS.values()) - 1)
+
+    @staticmethod
+    def models_for(columns) -> List[str]:
+        """Which models can score rows with these (normalized) columns"""
+        columns = set(columns)
+        available = []
+        if columns.issuperset(BatchScoringService.DEMAND_COLUMNS):
+            available.append('demand')
+        if columns.issuperset(BatchScoringService.CRISIS_COLUMNS):
+            available.append('crisis')
+        if columns.issuperset(BatchScoringService.PRIORITY_COLUMNS):
+            available.append('priority')
+        return available
+
+    @staticmethod
+    def score_chunk(chunk: pd.DataFrame, domain: str, offset: int = 0,
+                    lag_tail: Optional[pd.DataFrame] = None
+                    ) -> Tuple[pd.DataFrame, Optional[pd.DataFrame]]:
+        """
+        Score one chunk; returns identifiers plus every applicable model's
+        outputs, and the demand history for the next chunk (see prepare)
+        """
+        df, lag_tail = BatchScoringService.prepare(chunk, lag_tail)
+        df.index = pd.RangeIndex(offset, offset + len(df))
+        models = BatchScoringService.models_for(df.columns)
+
+        parts = [pd.DataFrame({'row': df.index}, index=df.index),
+                 df[[c for c in ID_COLUMNS if c in df.columns]]]
+        districts = df['district'].dropna().unique() if 'district' in df.columns else ()
+        if 'demand' in models:
+            demand = DemandForecastingService.predict_frame(df)
+            dashboard_stats.record_predictions(
+                'demand_forecasting', int(demand['predicted_demand'].notna().sum()), districts)
+            parts.append(demand)
+        if 'crisis' in models:
+            crisis = CrisisPredictionService.predict_frame(df)
+            levels = crisis['crisis_alert_level'].value_counts()
+            dashboard_stats.record_predictions(
+                'crisis_prediction', int(levels.sum()), districts,
+                alert_levels={level: int(n) for level, n in levels.items()})
+            parts.append(crisis)
+        if 'priority' in models:
+            row_domain = df['domain'] if 'domain' in df.columns else \
+                PRIORITY_DOMAINS.get(domain.lower(), domain)
+            priority = PriorityService.calculate_frame(df, row_domain)
+            dashboard_stats.record_predictions(
+                'priority_scoring', int(priority['priority_score'].notna().sum()), districts)
+            parts.append(priority)
+
+        return pd.concat(parts, axis=1), lag_tail
+
+    @staticmethod
+    def stream(chunks: Iterator[pd.DataFrame], domain: str,
+               output_format: str = "ndjson") -> Iterator[bytes]:
+        """
+        Score chunks as they are parsed and yield NDJSON (or CSV) bytes
+        A chunk that fails to score is reported with an error line (a JSON
+        object, or a '#' comment line in CSV) and the stream moves on; a
+        file that fails to parse mid-way ends with one
+        """
+        offset = 0
+        header = True
+        lag_tail = None
+        chunks = iter(chunks)
+        while True:
+            try:
+                chunk = next(chunks, None)
+            except Exception as e:
+                logger.log_error(e, "Batch scoring failed")
+                yield BatchScoringService._error_line(output_format, offset, None, e)
+                return
+            if chunk is None:
+                return
+
+            try:
+                scored, lag_tail = BatchScoringService.score_chunk(
+                    chunk, domain, offset, lag_tail)
+            except Exception as e:
+                logger.log_error(e, "Batch scoring failed")
+                yield BatchScoringService._error_line(
+                    output_format, offset, offset + len(chunk), e)
+                offset += len(chunk)
+                continue
+            offset += len(chunk)
+
+            if output_format == "csv":
+                yield scored.to_csv(index=False, header=header).encode()
+                header = False
+            else:
+                # lines=True output already ends with a newline
+                yield scored.to_json(orient="records", lines=True,
+                                     date_format="iso").encode()
+
+    @staticmethod
+    def _error_line(output_format: str, start: int, end: Optional[int],
+                    error: Exception) -> bytes:
+        """Error record for rows [start, end), or everything from start if end is None"""
+        message = f"Scoring failed: {error}"
+        if output_format == "csv":
+            rows = f"rows {start}-{end - 1}" if end is not None else f"rows from {start}"
+            return f"# {rows}: {message}\n".encode()
+        return (json.dumps({"error": message, "row_start": start, "row_end": end}) + "\n").encode()
@@ -1,5 +1,7 @@
+import numpy as np
 import pandas as pd
 from services.model_loader import model_loader
+from services.demand_service import _encode
 from models.requests import CrisisPredictionRequest
 from models.responses import CrisisPredictionResponse, CrisisPrediction
 from middleware.data_privacy import privacy_framework
@@ -16,8 +18,8 @@ class CrisisPredictionService:
         """
         Predict water shortage crisis
         """
-        # Anonymize data
-        anonymized_data = privacy_framework.anonymize_data(request.dict())
+        # Anonymize data (cached per-schema plan; no-op when there is no PII)
+        anonymized_data = privacy_framework.anonymize_request(request)
 
         # Encode features
         district_encoded = model_loader.crisis_encoders['district'].transform([
@@ -96,3 +98,45 @@ class CrisisPredictionService:
         )
 
         return response
+
+    @staticmethod
+    def predict_frame(df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Vectorized crisis prediction for many rows (CrisisPredictionRequest columns)
+        Rows with districts unknown to the encoder get null outputs
+        """
+        district_encoded = _encode(model_loader.crisis_encoders['district'], df['district'])
+
+        features = pd.DataFrame({
+            'district_encoded': district_encoded,
+            'month': df['month'],
+            'is_monsoon': df['is_monsoon'],
+            'population_factor': df['population_factor'],
+            'demand_requests': df['demand_requests'],
+            'pending_requests': df['pending_requests'],
+            'citizen_complaints': df['citizen_complaints'],
+            'response_time_hours': df['response_time_hours'],
+            'demand_lag_7days': df['demand_lag_7days'],
+            'demand_lag_30days': df['demand_lag_30days'],
+            'demand_trend': df['demand_lag_7days'] - df['demand_lag_30days'],
+            'resolution_rate': df['resolution_rate'],
+            'response_efficiency': 100 / (df['response_time_hours'] + 1),
+            'water_level_drop_7days': 0,
+            'water_level_drop_30days': 0
+        }, index=df.index).astype(float)
+
+        valid = features['district_encoded'].notna()
+        probability = pd.Series(np.nan, index=df.index)
+        if valid.any():
+            probability[valid] = model_loader.crisis_model.predict_proba(
+                features[valid])[:, 1]
+
+        alert_level = np.select(
+            [probability > 0.8, probability > 0.6, probability > 0.4],
+            ["CRITICAL", "HIGH", "MEDIUM"], default="LOW")
+
+        return pd.DataFrame({
+            'crisis_probability': probability.round(3),
+            'crisis_predicted': (probability > 0.5).where(valid),
+            'crisis_alert_level': np.where(valid, alert_level, None)
+        }, index=df.index)
@@ -0,0 +1,126 @@
+"""
+Cached response snapshots for the dashboard read endpoints
+Each function returns the current CachedPayload for one endpoint, rebuilt
+only when its version changes. /dashboard/summary cuts its sections out of
+the same payloads, once per payload version, so a poll of the summary
+serializes nothing that has not changed
+"""
+
+import json
+from datetime import date
+from typing import Any, Callable, Dict, Tuple
+import pandas as pd
+from config.settings import settings
+from models.responses import HealthCheckResponse
+from middleware.data_privacy import privacy_framework
+from services.model_loader import model_loader
+from services.dashboard_stats import dashboard_stats
+from services.alert_board import alert_board
+from utils.http_cache import CachedPayload, snapshot_cache
+
+
+def alerts_payload() -> CachedPayload:
+    return alert_board.snapshot.payload
+
+
+def statistics_version() -> Tuple[int, int, date]:
+    """Changes whenever current_statistics' output would"""
+    return dashboard_stats.version, alert_board.snapshot.payload.version, date.today()
+
+
+def current_statistics() -> Dict[str, Any]:
+    """Live counters plus the alert board's count of CRITICAL wards"""
+    statistics = dashboard_stats.snapshot()
+    statistics["critical_alerts"] = alert_board.snapshot.critical_count
+    return statistics
+
+
+def statistics_payload() -> CachedPayload:
+    # Re-serialized only when a counter, the alert board (or the day) changed
+    return snapshot_cache.get(
+        "statistics", statistics_version(),
+        lambda: {
+            "success": True,
+            "statistics": current_statistics(),
+            "timestamp": pd.Timestamp.now().isoformat()
+        })
+
+
+def privacy_report_payload() -> CachedPayload:
+    return snapshot_cache.get(
+        "privacy-report", privacy_framework.privacy_report_version(),
+        lambda: {
+            "success": True,
+            "privacy_report": privacy_framework.generate_privacy_report(),
+            "timestamp": pd.Timestamp.now().isoformat()
+        })
+
+
+def health_payload() -> CachedPayload:
+    version = (model_loader.demand_model is not None,
+               model_loader.crisis_model is not None,
+               model_loader.priority_engine is not None,
+               privacy_framework.privacy_report_version())
+    return snapshot_cache.get("health", version, _health_report)
+
+
+def _health_report() -> HealthCheckResponse:
+    return HealthCheckResponse(
+        status="healthy",
+        api_version=settings.APP_VERSION,
+        models={
+            "demand_forecasting": {
+                "loaded": model_loader.demand_model is not None,
+                "type": "XGBoost Regressor",
+                "performance": "R² = 0.960"
+            },
+            "crisis_prediction": {
+                "loaded": model_loader.crisis_model is not None,
+                "type": "XGBoost Classifier",
+                "performance": "F1 = 0.992, Accuracy = 99.8%"
+            },
+            "priority_engine": {
+                "loaded": model_loader.priority_engine is not None,
+                "type": "Multi-criteria Ranking"
+            }
+        },
+        privacy_framework=privacy_framework.generate_privacy_report()
+    )
+
+
+def _without_envelope(body: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: value for key, value in body.items() if key != "success"}
+
+
+# /dashboard/summary section name -> (snapshot, section cut from its body)
+SUMMARY_SECTIONS: Dict[str, Tuple[Callable[[], CachedPayload],
+                                  Callable[[Dict[str, Any]], Any]]] = {
+    "statistics": (statistics_payload, lambda body: body["statistics"]),
+    "alerts": (alerts_payload, _without_envelope),
+    "health": (health_payload, lambda body: body),
+    "privacy_report": (privacy_report_payload, lambda body: body["privacy_report"]),
+}
+
+
+def _summary_section(name: str) -> CachedPayload:
+    """One section's content without its endpoint's success flag, cut once per version"""
+    payload, extract = SUMMARY_SECTIONS[name]
+    payload = payload()
+    return snapshot_cache.get("summary-section:" + name, payload.etag,
+                              lambda: extract(json.loads(payload.body)))
+
+
+def summary_payload(sections) -> CachedPayload:
+    """
+    One document embedding the selected sections, with a single top-level
+    success flag. Spliced from each section's cached bytes
+    """
+    payloads = [(name, _summary_section(name)) for name in sections]
+    version = tuple((name, payload.etag) for name, payload in payloads)
+
+    def build() -> bytes:
+        parts = [b'"' + name.encode() + b'":' + payload.body
+                 for name, payload in payloads]
+        return b'{"success":true,' + b','.join(parts) + b'}'
+
+    return snapshot_cache.get_bytes("summary:" + ",".join(sections), version, build)
@@ -0,0 +1,160 @@
+from collections import Counter
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, Optional
+from config.settings import settings
+from services.model_loader import model_loader
+from utils.periodic_snapshot import PeriodicSnapshot
+
+
+class DashboardStatistics(PeriodicSnapshot):
+    """
+    Running counters behind /dashboard/statistics
+    Predictions, alerts and uploads update the counters as they happen, so
+    reading them is O(1) instead of a rescan of the activity log. A daemon
+    thread snapshots the counters to disk; start() restores the snapshot
+    """
+
+    snapshot_name = "dashboard-stats"
+    snapshot_label = "Dashboard statistics"
+
+    def __init__(self, path: str, persist_interval: float, retention_days: int):
+        super().__init__(path, persist_interval)
+        self.retention_days = retention_days
+        self.version = 0
+        self._reset()
+
+    def _reset(self):
+        self.started_at = datetime.now().isoformat()
+        # Per-day counters: {'YYYY-MM-DD': {'predictions': {model: n}, ...}}
+        self.days: Dict[str, Dict[str, Counter]] = {}
+        # Lifetime latency per model: {model: [count, total_ms]}
+        self.latency: Dict[str, list] = {}
+        self.districts = set()
+        self.domains = set()
+
+    # Recording
+
+    def record_prediction(self, model: str, district: Optional[str],
+                          latency_ms: float, alert_level: str = None):
+        """One API prediction"""
+        self.record_predictions(
+            model, 1, [district] if district else (),
+            latency_ms=latency_ms,
+            alert_levels={alert_level: 1} if alert_level else None)
+
+    def record_predictions(self, model: str, count: int,
+                           districts: Iterable[str] = (),
+                           latency_ms: float = None,
+                           alert_levels: Dict[str, int] = None):
+        """A batch of predictions from one model (latency covers the whole batch)"""
+        if count <= 0:
+            return
+        with self._lock:
+            day = self._today()
+            day['predictions'][model] += count
+            if alert_levels:
+                day['alerts'].update(alert_levels)
+            if latency_ms is not None:
+                entry = self.latency.setdefault(model, [0, 0.0])
+                entry[0] += 1
+                entry[1] += latency_ms
+            self.districts.update(districts)
+            self._changed()
+
+    def record_upload(self, domain: str, records: int):
+        """One completed (non-duplicate) upload"""
+        with self._lock:
+            day = self._today()
+            day['uploads'][domain] += 1
+            day['records_ingested'][domain] += records
+            self.domains.add(domain)
+            self._changed()
+
+    def _changed(self):
+        self._dirty = True
+        self.version += 1
+
+    def _today(self) -> Dict[str, Counter]:
+        key = date.today().isoformat()
+        day = self.days.get(key)
+        if day is None:
+            day = self.days[key] = self._empty_day()
+            self._prune()
+        return day
+
+    @staticmethod
+    def _empty_day() -> Dict[str, Counter]:
+        return {'predictions': Counter(), 'alerts': Counter(),
+                'uploads': Counter(), 'records_ingested': Counter()}
+
+    def _prune(self):
+        cutoff = (date.today() - timedelta(days=self.retention_days)).isoformat()
+        for key in [k for k in self.days if k < cutoff]:
+            del self.days[key]
+
+    # Reading
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current statistics; cost does not grow with traffic"""
+        with self._lock:
+            today = self.days.get(date.today().isoformat()) or self._empty_day()
+            calls = sum(count for count, _ in self.latency.values())
+            total_ms = sum(ms for _, ms in self.latency.values())
+
+            return {
+                "total_predictions_today": sum(today['predictions'].values()),
+                "predictions_today_by_model": dict(today['predictions']),
+                "alerts_today_by_level": dict(today['alerts']),
+                "districts_monitored": len(self.districts),
+                "average_latency_ms": round(total_ms / calls, 2) if calls else None,
+                "average_latency_ms_by_model": {
+                    model: round(ms / count, 2)
+                    for model, (count, ms) in self.latency.items() if count},
+                "models_active": self._models_active(),
+                "data_sources_integrated": len(self.domains),
+                "uploads_today": sum(today['uploads'].values()),
+                "records_ingested_today": sum(today['records_ingested'].values()),
+                "counting_since": self.started_at
+            }
+
+    @staticmethod
+    def _models_active() -> int:
+        return sum(model is not None for model in (
+            model_loader.demand_model,
+            model_loader.crisis_model,
+            model_loader.priority_engine))
+
+    # Persistence
+
+    def _snapshot_state(self) -> Dict[str, Any]:
+        return {
+            'started_at': self.started_at,
+            'days': {key: {name: dict(counter) for name, counter in day.items()}
+                     for key, day in self.days.items()},
+            'latency': self.latency,
+            'districts': sorted(self.districts),
+            'domains': sorted(self.domains)
+        }
+
+    def _restore_state(self, state: Dict[str, Any]):
+        with self._lock:
+            self._reset()
+            self.started_at = state.get('started_at', self.started_at)
+            for key, day in state.get('days', {}).items():
+                restored = self._empty_day()
+                for name, counts in day.items():
+                    if name in restored:
+                        restored[name].update(counts)
+                self.days[key] = restored
+            self.latency = {model: list(entry)
+                            for model, entry in state.get('latency', {}).items()}
+            self.districts = set(state.get('districts', []))
+            self.domains = set(state.get('domains', []))
+            self._prune()
+            self.version += 1
+
+
+dashboard_stats = DashboardStatistics(
+    settings.DASHBOARD_STATS_PATH,
+    persist_interval=settings.DASHBOARD_STATS_PERSIST_SECONDS,
+    retention_days=settings.DASHBOARD_STATS_RETENTION_DAYS)
@@ -0,0 +1,187 @@
+import asyncio
+import itertools
+import json
+from typing import Any, Dict, List, Optional, Set
+from config.settings import settings
+from services.alert_board import alert_board
+from services.dashboard_snapshots import current_statistics, statistics_version
+from utils.logger import logger
+
+
+_EVICTED = object()
+
+
+class Subscriber:
+    """One connected dashboard: a bounded queue of pre-encoded SSE frames"""
+
+    __slots__ = ('queue', 'evicted')
+
+    def __init__(self, queue_size: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.evicted = False
+
+
+class DashboardBroadcaster:
+    """
+    Single publisher fanning alert-board and statistics changes out to SSE clients
+    One task watches the snapshot versions; when one changes it encodes a
+    delta event once and hands the same bytes to every subscriber. Each
+    subscriber has a bounded queue: a client that falls that far behind is
+    evicted (and reconnects to a fresh snapshot) instead of buffering
+    without limit
+    """
+
+    def __init__(self, poll_interval: float, heartbeat_interval: float,
+                 queue_size: int, max_clients: int):
+        self.poll_interval = poll_interval
+        self.heartbeat_interval = heartbeat_interval
+        self.queue_size = queue_size
+        self.max_clients = max_clients
+        self._subscribers: Set[Subscriber] = set()
+        self._event_ids = itertools.count(1)
+        self._task: Optional[asyncio.Task] = None
+        self._alerts_version = None
+        self._stats_version = None
+        self._alerts: Dict[tuple, Dict[str, Any]] = {}
+        self._statistics: Dict[str, Any] = {}
+        self._snapshot_frame: Optional[bytes] = None
+        self.evictions = 0
+
+    @property
+    def client_count(self) -> int:
+        return len(self._subscribers)
+
+    def start(self):
+        """Start the publisher task on the running event loop"""
+        if self._task is None or self._task.done():
+            self._refresh_state()
+            self._task = asyncio.get_running_loop().create_task(self._publish())
+
+    async def shutdown(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for subscriber in list(self._subscribers):
+            self._evict(subscriber)
+
+    def subscribe(self) -> Subscriber:
+        """Register a client and queue the full current state as its first event"""
+        if len(self._subscribers) >= self.max_clients:
+            raise OverflowError("Too many dashboard stream clients, retry later")
+
+        if self._snapshot_frame is None:
+            self._snapshot_frame = self._frame("snapshot", {
+                "alerts": list(self._alerts.values()),
+                "statistics": self._statistics
+            }, retry=True)
+
+        subscriber = Subscriber(self.queue_size)
+        subscriber.queue.put_nowait(self._snapshot_frame)
+        self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        self._subscribers.discard(subscriber)
+
+    async def frames(self, subscriber: Subscriber):
+        """Yield encoded frames for one client until it is evicted"""
+        while True:
+            frame = await subscriber.queue.get()
+            if frame is _EVICTED:
+                yield self._frame("evicted", {"reason": "client too slow"})
+                return
+            yield frame
+
+    async def _publish(self):
+        idle = 0.0
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                events = self._collect_deltas()
+                if events:
+                    self._snapshot_frame = None
+                for event in events:
+                    self._broadcast(event)
+
+                idle = 0.0 if events else idle + self.poll_interval
+                if idle >= self.heartbeat_interval:
+                    self._broadcast(b": keepalive\n\n")
+                    idle = 0.0
+            except Exception as e:
+                logger.log_error(e, "Dashboard stream publish failed")
+
+    def _collect_deltas(self) -> List[bytes]:
+        """Encoded delta events for whatever changed since the last check"""
+        events = []
+
+        snapshot = alert_board.snapshot
+        if snapshot.payload.version != self._alerts_version:
+            previous = self._alerts
+            self._alerts_version = snapshot.payload.version
+            self._alerts = {(a["district"], a["ward"]): a for a in snapshot.alerts}
+            upserted = [alert for key, alert in self._alerts.items()
+                        if previous.get(key) != alert]
+            removed = [{"district": d, "ward": w}
+                       for d, w in previous.keys() - self._alerts.keys()]
+            if upserted or removed:
+                events.append(self._frame("alerts", {
+                    "upserted": upserted,
+                    "removed": removed,
+                    "total_count": len(self._alerts),
+                    "generated_at": snapshot.generated_at
+                }))
+
+        version = statistics_version()
+        if version != self._stats_version:
+            previous = self._statistics
+            self._stats_version = version
+            self._statistics = current_statistics()
+            changed = {key: value for key, value in self._statistics.items()
+                       if previous.get(key) != value}
+            if changed:
+                events.append(self._frame("statistics", changed))
+
+        return events
+
+    def _refresh_state(self):
+        snapshot = alert_board.snapshot
+        self._alerts_version = snapshot.payload.version
+        self._alerts = {(a["district"], a["ward"]): a for a in snapshot.alerts}
+        self._stats_version = statistics_version()
+        self._statistics = current_statistics()
+
+    def _broadcast(self, frame: bytes):
+        for subscriber in list(self._subscribers):
+            try:
+                subscriber.queue.put_nowait(frame)
+            except asyncio.QueueFull:
+                self._evict(subscriber)
+
+    def _evict(self, subscriber: Subscriber):
+        """Drop a backed-up client; its stream ends after an 'evicted' event"""
+        self._subscribers.discard(subscriber)
+        if subscriber.evicted:
+            return
+        subscriber.evicted = True
+        self.evictions += 1
+        while not subscriber.queue.empty():
+            subscriber.queue.get_nowait()
+        subscriber.queue.put_nowait(_EVICTED)
+
+    def _frame(self, event: str, data: Any, retry: bool = False) -> bytes:
+        lines = [f"id: {next(self._event_ids)}", f"event: {event}"]
+        if retry:
+            lines.append(f"retry: {settings.DASHBOARD_STREAM_RETRY_MS}")
+        lines.append("data: " + json.dumps(data, separators=(",", ":")))
+        return ("\n".join(lines) + "\n\n").encode()
+
+
+dashboard_broadcaster = DashboardBroadcaster(
+    poll_interval=settings.DASHBOARD_STREAM_POLL_SECONDS,
+    heartbeat_interval=settings.DASHBOARD_STREAM_HEARTBEAT_SECONDS,
+    queue_size=settings.DASHBOARD_STREAM_QUEUE_SIZE,
+    max_clients=settings.DASHBOARD_STREAM_MAX_CLIENTS)
@@ -0,0 +1,233 @@
+import json
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional
+import numpy as np
+import pandas as pd
+from config.settings import settings
+from services.warehouse import check_domain
+
+
+# Valid ranges for known fields (mirrors the request model constraints)
+VALUE_RANGES = {
+    'month': (1, 12),
+    'day_of_week': (0, 6),
+    'is_weekend': (0, 1),
+    'is_monsoon': (0, 1),
+}
+
+_HLL_PRECISION = 12
+_HLL_REGISTERS = 1 << _HLL_PRECISION
+
+
+def _bit_length(values: np.ndarray) -> np.ndarray:
+    """Bit length of uint64 values (exact; avoids float rounding near 2**k)"""
+    high = (values >> np.uint64(32)).astype(np.float64)
+    low = (values & np.uint64(0xFFFFFFFF)).astype(np.float64)
+    with np.errstate(divide='ignore'):
+        high_bits = np.where(high > 0, np.floor(np.log2(high)) + 33, 0)
+        low_bits = np.where(low > 0, np.floor(np.log2(low)) + 1, 0)
+    return np.where(high > 0, high_bits, low_bits).astype(np.int64)
+
+
+class HyperLogLog:
+    """Mergeable approximate distinct counter (~1.6% standard error)"""
+
+    def __init__(self):
+        self.registers = np.zeros(_HLL_REGISTERS, dtype=np.uint8)
+
+    def add_hashes(self, hashes: np.ndarray):
+        hashes = hashes.astype(np.uint64, copy=False)
+        index = (hashes >> np.uint64(64 - _HLL_PRECISION)).astype(np.int64)
+        remainder = hashes << np.uint64(_HLL_PRECISION)
+        # rank = leading zeros + 1 of the remaining bits
+        rank = np.minimum(65 - _bit_length(remainder),
+                          64 - _HLL_PRECISION + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+
+    def merge(self, other: 'HyperLogLog'):
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def estimate(self) -> int:
+        m = _HLL_REGISTERS
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.sum(np.power(2.0, -self.registers.astype(np.float64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and zeros:
+            return int(round(m * np.log(m / zeros)))
+        return int(round(raw))
+
+
+class ColumnProfile:
+    """
+    Streaming, mergeable statistics for one column
+    A redacted (PII) column keeps only counts and its distinct-count
+    sketch: no value, bound or sum derived from its contents is retained
+    """
+
+    def __init__(self, name: str, redacted: bool = False):
+        self.name = name
+        self.redacted = redacted
+        self.count = 0
+        self.null_count = 0
+        self.numeric_count = 0
+        self.min = None
+        self.max = None
+        self.sum = 0.0
+        self.out_of_range = 0
+        self.distinct = HyperLogLog()
+        self.categories = Counter()
+
+    def update(self, column: pd.Series):
+        self.count += len(column)
+        present = column.dropna()
+        self.null_count += len(column) - len(present)
+        if present.empty:
+            return
+
+        self.distinct.add_hashes(
+            pd.util.hash_pandas_object(present, index=False).to_numpy())
+        if self.redacted:
+            return
+
+        if pd.api.types.is_datetime64_any_dtype(present):
+            low, high = present.min().isoformat(), present.max().isoformat()
+            self.min = low if self.min is None else min(self.min, low)
+            self.max = high if self.max is None else max(self.max, high)
+        elif pd.api.types.is_numeric_dtype(present) and not pd.api.types.is_bool_dtype(present):
+            values = present.to_numpy(dtype=np.float64)
+            self.numeric_count += len(values)
+            self.sum += float(values.sum())
+            low, high = float(values.min()), float(values.max())
+            self.min = low if self.min is None else min(self.min, low)
+            self.max = high if self.max is None else max(self.max, high)
+
+            bounds = VALUE_RANGES.get(self.name.lower())
+            if bounds is not None:
+                self.out_of_range += int(
+                    ((values < bounds[0]) | (values > bounds[1])).sum())
+        else:
+            self.categories.update(present.astype(str).value_counts().to_dict())
+            self._trim_categories()
+
+    def redact(self):
+        """Mark as PII and drop the value statistics gathered so far"""
+        self.redacted = True
+        self.numeric_count = 0
+        self.min = self.max = None
+        self.sum = 0.0
+        self.out_of_range = 0
+        self.categories = Counter()
+
+    def merge(self, other: 'ColumnProfile'):
+        if other.redacted and not self.redacted:
+            self.redact()
+        self.count += other.count
+        self.null_count += other.null_count
+        self.numeric_count += other.numeric_count
+        self.sum += other.sum
+        self.out_of_range += other.out_of_range
+        for attr, pick in (('min', min), ('max', max)):
+            mine, theirs = getattr(self, attr), getattr(other, attr)
+            setattr(self, attr, theirs if mine is None else
+                    mine if theirs is None else pick(mine, theirs))
+        self.distinct.merge(other.distinct)
+        if self.redacted:
+            return
+        self.categories.update(other.categories)
+        self._trim_categories()
+
+    def _trim_categories(self):
+        """Keep the category counter bounded (heavy hitters survive)"""
+        limit = settings.PROFILE_MAX_TRACKED_CATEGORIES
+        if len(self.categories) > 2 * limit:
+            self.categories = Counter(dict(self.categories.most_common(limit)))
+
+    def to_dict(self) -> Dict[str, Any]:
+        profile = {
+            'count': self.count,
+            'null_count': self.null_count,
+            'null_rate': round(self.null_count / self.count, 4) if self.count else 0.0,
+            'approx_distinct': self.distinct.estimate() if self.count > self.null_count else 0,
+        }
+        if self.redacted:
+            profile['redacted'] = True
+            return profile
+        if self.min is not None:
+            profile.update({'min': self.min, 'max': self.max})
+        if self.numeric_count:
+            profile['mean'] = round(self.sum / self.numeric_count, 4)
+        if self.name.lower() in VALUE_RANGES:
+            profile['out_of_range'] = self.out_of_range
+        if self.categories:
+            profile['top_categories'] = [
+                {'value': value, 'count': count} for value, count in
+                self.categories.most_common(settings.PROFILE_TOP_CATEGORIES)]
+        return profile
+
+
+class DatasetProfile:
+    """Per-column profiles built chunk by chunk during ingest"""
+
+    def __init__(self):
+        self.rows = 0
+        self.columns: Dict[str, ColumnProfile] = {}
+
+    def update(self, chunk: pd.DataFrame, redact=()):
+        """
+        Fold a chunk in; columns in redact (PII) keep only counts, including
+        columns first flagged after earlier chunks were profiled
+        """
+        self.rows += len(chunk)
+        for name in chunk.columns:
+            key = str(name)
+            if key not in self.columns:
+                self.columns[key] = ColumnProfile(key, redacted=name in redact)
+            elif name in redact and not self.columns[key].redacted:
+                self.columns[key].redact()
+            self.columns[key].update(chunk[name])
+
+    def merge(self, other: 'DatasetProfile'):
+        self.rows += other.rows
+        for key, column in other.columns.items():
+            if key in self.columns:
+                self.columns[key].merge(column)
+            else:
+                self.columns[key] = column
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'rows_profiled': self.rows,
+            'columns': {key: column.to_dict() for key, column in self.columns.items()}
+        }
+
+
+class ProfileStore:
+    """Persists ingest profiles as JSON under <root>/<domain>/"""
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+
+    def save(self, domain: str, profile: Dict[str, Any], filename: str = None) -> str:
+        domain = check_domain(domain)
+        directory = self.root / domain
+        directory.mkdir(parents=True, exist_ok=True)
+        created_at = datetime.now()
+        record = {'domain': domain, 'filename': filename,
+                  'created_at': created_at.isoformat(), **profile}
+        path = directory / f"profile-{created_at.strftime('%Y%m%dT%H%M%S%f')}.json"
+        with open(path, 'w') as f:
+            json.dump(record, f)
+        return str(path)
+
+    def latest(self, domain: str) -> Optional[Dict[str, Any]]:
+        files = sorted((self.root / check_domain(domain)).glob("profile-*.json"))
+        if not files:
+            return None
+        with open(files[-1]) as f:
+            return json.load(f)
+
+
+# Global profile store
+profile_store = ProfileStore(settings.PROFILE_DIR)
@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 from services.model_loader import model_loader
 from models.requests import DemandForecastRequest
@@ -16,8 +17,8 @@ class DemandForecastingService:
         """
         Predict service demand
         """
-        # Anonymize data
-        anonymized_data = privacy_framework.anonymize_data(request.dict())
+        # Anonymize data (cached per-schema plan; no-op when there is no PII)
+        anonymized_data = privacy_framework.anonymize_request(request)
 
         # Encode categorical variables
         district_encoded = model_loader.demand_encoders['district'].transform([
@@ -73,3 +74,51 @@ class DemandForecastingService:
         )
 
         return response
+
+    @staticmethod
+    def predict_frame(df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Vectorized demand forecast for many rows (DemandForecastRequest columns)
+        Rows with districts/services unknown to the encoders get null outputs
+        """
+        district_encoded = _encode(model_loader.demand_encoders['district'], df['district'])
+        service_encoded = _encode(model_loader.demand_encoders['service_type'], df['service_type'])
+        demand_trend = df['demand_lag_7days'] - df['demand_lag_30days']
+
+        features = pd.DataFrame({
+            'district_encoded': district_encoded,
+            'service_type_encoded': service_encoded,
+            'day_of_week': df['day_of_week'],
+            'month': df['month'],
+            'is_weekend': df['is_weekend'],
+            'is_monsoon': df['is_monsoon'],
+            'population_factor': df['population_factor'],
+            'urban_ratio': df['urban_ratio'],
+            'demand_lag_7days': df['demand_lag_7days'],
+            'demand_lag_30days': df['demand_lag_30days'],
+            'demand_trend': demand_trend,
+            'resource_utilization_rate': df['resource_utilization_rate'],
+            'complaint_rate': df['complaint_rate'],
+            'response_time_minutes': df['response_time_minutes']
+        }, index=df.index).astype(float)
+
+        valid = features[['district_encoded', 'service_type_encoded']].notna().all(axis=1)
+        predicted = pd.Series(np.nan, index=df.index)
+        if valid.any():
+            predicted[valid] = np.round(
+                model_loader.demand_model.predict(features[valid]))
+
+        return pd.DataFrame({
+            'predicted_demand': predicted.astype('Int64'),
+            'demand_confidence': np.where(valid, np.where(
+                demand_trend.abs() < 10, "High", "Medium"), None),
+            'demand_trend': np.where(valid, np.select(
+                [demand_trend > 0, demand_trend < 0],
+                ["Increasing", "Decreasing"], default="Stable"), None)
+        }, index=df.index)
+
+
+def _encode(encoder, values: pd.Series) -> pd.Series:
+    """LabelEncoder.transform for a column; unknown labels become NaN"""
+    mapping = {label: code for code, label in enumerate(encoder.classes_)}
+    return values.map(mapping)
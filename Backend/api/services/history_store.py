@@ -0,0 +1,210 @@
+import json
+import threading
+from datetime import date
+from pathlib import Path
+from typing import Dict, List, Optional
+import numpy as np
+import pandas as pd
+from config.settings import settings
+
+
+# Layout order; rows are sorted by these, timestamp last
+SORT_COLUMNS = ('district', 'service_type')
+
+
+def _narrow_codes(codes: np.ndarray, cardinality: int) -> np.ndarray:
+    for dtype in (np.int8, np.int16, np.int32):
+        if cardinality <= np.iinfo(dtype).max:
+            return codes.astype(dtype)
+    return codes.astype(np.int64)
+
+
+class DomainHistory:
+    """
+    Compact, read-only column store for one domain's history
+    Text columns are dictionary-encoded into the narrowest integer codes,
+    integers are downcast, floats stored as float32 and timestamps as
+    int32 epoch days. Rows are sorted by (district, service_type,
+    timestamp), and an offset index gives each district/service_type pair
+    its contiguous row range, so a lookup is two binary searches plus a
+    slice. Saved arrays can be memory-mapped, letting every worker process
+    share one copy through the page cache
+    """
+
+    def __init__(self, columns: Dict[str, np.ndarray],
+                 dictionaries: Dict[str, List[str]]):
+        self.columns = columns
+        self.dictionaries = dictionaries
+        self._codes = {name: {value: code for code, value in enumerate(values)}
+                       for name, values in dictionaries.items()}
+
+        # Offset index: one entry per (district, service_type) run
+        group_ids = self._group_ids(columns['district'], columns['service_type'])
+        starts = np.flatnonzero(np.r_[True, group_ids[1:] != group_ids[:-1]]) \
+            if len(group_ids) else np.empty(0, np.int64)
+        self.group_keys = group_ids[starts]
+        self.group_offsets = np.r_[starts, len(group_ids)].astype(np.int64)
+
+    def __len__(self) -> int:
+        return len(self.columns['timestamp'])
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the column arrays and offset index"""
+        return sum(array.nbytes for array in self.columns.values()) + \
+            self.group_keys.nbytes + self.group_offsets.nbytes
+
+    # Building
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "DomainHistory":
+        """Encode and sort a domain DataFrame (needs timestamp/district/service_type)"""
+        columns = {}
+        dictionaries = {}
+        for name in df.columns:
+            series = df[name]
+            if name == 'timestamp':
+                columns[name] = pd.to_datetime(series).values \
+                    .astype('datetime64[D]').astype(np.int32)
+            elif pd.api.types.is_integer_dtype(series) or pd.api.types.is_bool_dtype(series):
+                columns[name] = pd.to_numeric(series.astype(np.int64),
+                                              downcast='integer').to_numpy()
+            elif pd.api.types.is_float_dtype(series):
+                columns[name] = series.to_numpy(dtype=np.float32)
+            else:
+                # Sorted dictionary, so code order is value order
+                codes, values = pd.factorize(series.astype(str), sort=True)
+                dictionaries[name] = values.tolist()
+                columns[name] = _narrow_codes(codes, len(values))
+
+        order = np.lexsort((columns['timestamp'],) +
+                           tuple(columns[name] for name in reversed(SORT_COLUMNS)))
+        return cls({name: array[order] for name, array in columns.items()},
+                   dictionaries)
+
+    def _group_ids(self, district_codes: np.ndarray,
+                   service_codes: np.ndarray) -> np.ndarray:
+        width = max(len(self.dictionaries['service_type']), 1)
+        return district_codes.astype(np.int64) * width + service_codes
+
+    # Lookup
+
+    def lookup(self, district: str, service_type: str = None,
+               start_date: date = None, end_date: date = None,
+               columns: List[str] = None, limit: int = None) -> pd.DataFrame:
+        """
+        Rows for a district (and service type) between two dates, decoded
+        limit keeps the first rows in (service_type, timestamp) order
+        """
+        rows = self.row_range(district, service_type, start_date, end_date)
+        if limit is not None:
+            rows = slice(rows.start, min(rows.stop, rows.start + limit)) \
+                if isinstance(rows, slice) else rows[:limit]
+        return self.decode(rows, columns)
+
+    def row_range(self, district: str, service_type: str = None,
+                  start_date: date = None, end_date: date = None):
+        """Row ids of a lookup: a slice for one pair, an index array otherwise"""
+        district_code = self._codes['district'].get(district)
+        if district_code is None:
+            return slice(0, 0)
+
+        if service_type is not None:
+            service_code = self._codes['service_type'].get(service_type)
+            if service_code is None:
+                return slice(0, 0)
+            key = self._group_ids(np.array([district_code]), np.array([service_code]))[0]
+            group = np.searchsorted(self.group_keys, key)
+            if group == len(self.group_keys) or self.group_keys[group] != key:
+                return slice(0, 0)
+            start, end = self.group_offsets[group], self.group_offsets[group + 1]
+            return slice(*self._date_bounds(start, end, start_date, end_date))
+
+        # Whole district: its runs are contiguous, each sorted by time
+        low = self._group_ids(np.array([district_code]), np.array([0]))[0]
+        width = len(self.dictionaries['service_type'])
+        first, last = np.searchsorted(self.group_keys, [low, low + width])
+        ranges = [self._date_bounds(self.group_offsets[group],
+                                    self.group_offsets[group + 1], start_date, end_date)
+                  for group in range(first, last)]
+        return np.concatenate([np.arange(start, end) for start, end in ranges]) \
+            if ranges else slice(0, 0)
+
+    def _date_bounds(self, start: int, end: int, start_date: Optional[date],
+                     end_date: Optional[date]):
+        timestamps = self.columns['timestamp'][start:end]
+        if start_date is not None:
+            start += int(np.searchsorted(timestamps, self._epoch_day(start_date), 'left'))
+            timestamps = self.columns['timestamp'][start:end]
+        if end_date is not None:
+            end = start + int(np.searchsorted(timestamps, self._epoch_day(end_date), 'right'))
+        return start, end
+
+    @staticmethod
+    def _epoch_day(day: date) -> int:
+        return int(np.datetime64(day, 'D').astype(np.int64))
+
+    def decode(self, rows, columns: List[str] = None) -> pd.DataFrame:
+        """Materialize rows as a DataFrame with the original values"""
+        data = {}
+        for name in columns or list(self.columns):
+            values = self.columns[name][rows]
+            if name == 'timestamp':
+                data[name] = values.astype('datetime64[D]')
+            elif name in self.dictionaries:
+                data[name] = pd.Categorical.from_codes(values, self.dictionaries[name])
+            else:
+                data[name] = values
+        return pd.DataFrame(data)
+
+    # Persistence
+
+    def save(self, directory: str):
+        """Write one .npy per column plus the dictionaries"""
+        path = Path(directory)
+        path.mkdir(parents=True, exist_ok=True)
+        for name, array in self.columns.items():
+            np.save(path / f"{name}.npy", array)
+        with open(path / "dictionaries.json", 'w') as f:
+            json.dump({'columns': list(self.columns),
+                       'dictionaries': self.dictionaries}, f)
+
+    @classmethod
+    def open(cls, directory: str, mmap: bool = True) -> "DomainHistory":
+        """Load saved columns; memory-mapped (shared, read-only) by default"""
+        path = Path(directory)
+        with open(path / "dictionaries.json") as f:
+            meta = json.load(f)
+        columns = {name: np.load(path / f"{name}.npy", mmap_mode='r' if mmap else None)
+                   for name in meta['columns']}
+        return cls(columns, meta['dictionaries'])
+
+
+class HistoryStore:
+    """DomainHistory per domain, built from the bundled data on first use"""
+
+    def __init__(self, paths: Dict[str, str]):
+        self.paths = paths
+        self._domains: Dict[str, DomainHistory] = {}
+        self._lock = threading.Lock()
+
+    def get(self, domain: str) -> DomainHistory:
+        domain = domain.lower()
+        history = self._domains.get(domain)
+        if history is not None:
+            return history
+
+        with self._lock:
+            if domain not in self._domains:
+                if domain not in self.paths:
+                    raise KeyError(f"No history for domain: {domain}")
+                self._domains[domain] = DomainHistory.from_frame(
+                    pd.read_csv(self.paths[domain]))
+            return self._domains[domain]
+
+    def put(self, domain: str, history: DomainHistory):
+        with self._lock:
+            self._domains[domain.lower()] = history
+
+
+history_store = HistoryStore(settings.DOMAIN_DATA_PATHS)
@@ -0,0 +1,290 @@
+import json
+import os
+import shutil
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, List, Optional
+from config.settings import settings
+from services.ingest_service import IngestService
+from utils.logger import logger
+
+
+TERMINAL_STATES = ('completed', 'failed')
+
+
+class IngestJobStore:
+    """
+    Durable job state for background ingest (local SQLite)
+    Survives worker restarts; the queue re-submits unfinished jobs on start
+    """
+
+    _COLUMNS = ('id', 'status', 'domain', 'filename', 'file_format', 'file_path',
+                'sheets', 'total_bytes', 'bytes_processed', 'rows_processed',
+                'chunks_committed', 'created_at', 'started_at', 'updated_at',
+                'finished_at', 'result', 'error')
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS ingest_jobs (
+                    id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    domain TEXT NOT NULL,
+                    filename TEXT,
+                    file_format TEXT NOT NULL,
+                    file_path TEXT NOT NULL,
+                    sheets TEXT,
+                    total_bytes INTEGER NOT NULL DEFAULT 0,
+                    bytes_processed INTEGER NOT NULL DEFAULT 0,
+                    rows_processed INTEGER NOT NULL DEFAULT 0,
+                    chunks_committed INTEGER NOT NULL DEFAULT 0,
+                    created_at TEXT NOT NULL,
+                    started_at TEXT,
+                    updated_at TEXT,
+                    finished_at TEXT,
+                    result TEXT,
+                    error TEXT
+                )""")
+            existing = {row[1] for row in
+                        conn.execute("PRAGMA table_info(ingest_jobs)")}
+            if 'chunks_committed' not in existing:
+                conn.execute("ALTER TABLE ingest_jobs ADD COLUMN "
+                             "chunks_committed INTEGER NOT NULL DEFAULT 0")
+            if 'sheets' not in existing:
+                conn.execute("ALTER TABLE ingest_jobs ADD COLUMN sheets TEXT")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def create(self, job: Dict[str, Any]):
+        columns = ', '.join(job)
+        placeholders = ', '.join('?' for _ in job)
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                f"INSERT INTO ingest_jobs ({columns}) VALUES ({placeholders})",
+                list(job.values()))
+
+    def update(self, job_id: str, **fields):
+        fields['updated_at'] = datetime.now().isoformat()
+        if 'result' in fields and fields['result'] is not None:
+            fields['result'] = json.dumps(fields['result'])
+        assignments = ', '.join(f"{name} = ?" for name in fields)
+        with self._lock, self._connect() as conn:
+            conn.execute(f"UPDATE ingest_jobs SET {assignments} WHERE id = ?",
+                         [*fields.values(), job_id])
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._connect() as conn:
+            row = conn.execute(
+                f"SELECT {', '.join(self._COLUMNS)} FROM ingest_jobs WHERE id = ?",
+                (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(zip(self._COLUMNS, row))
+        job['result'] = json.loads(job['result']) if job['result'] else None
+        job['sheets'] = json.loads(job['sheets']) if job['sheets'] else None
+        return job
+
+    def unfinished(self) -> List[Dict[str, Any]]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT id FROM ingest_jobs WHERE status IN ('queued', 'running') "
+                "ORDER BY created_at").fetchall()
+        return [self.get(job_id) for (job_id,) in rows]
+
+
+class IngestJobQueue:
+    """
+    Bounded local worker pool for background upload ingest
+    Uploads are persisted to disk, queued, and processed off the request
+    path; clients poll or subscribe to the job for progress and results
+    """
+
+    def __init__(self, store: IngestJobStore, upload_dir: str,
+                 workers: int, max_pending: int):
+        self.store = store
+        self.upload_dir = Path(upload_dir)
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor = None
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Start the worker pool and resume jobs left unfinished by a restart"""
+        self.upload_dir.mkdir(parents=True, exist_ok=True)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="ingest-worker")
+        for job in self.store.unfinished():
+            logger.logger.info(f"Resuming ingest job {job['id']}")
+            self.store.update(job['id'], status='queued')
+            self._dispatch(job['id'], force=True)
+
+    def shutdown(self):
+        """Stop accepting work; running jobs finish, queued ones resume on restart"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def submit(self, source: BinaryIO, filename: str, file_format: str,
+               domain: str, sheets: List[str] = None) -> Dict[str, Any]:
+        """Persist an upload to local disk and queue it for ingest"""
+        def persist(file_path: Path):
+            with open(file_path, 'wb') as out:
+                shutil.copyfileobj(source, out, length=1024 * 1024)
+
+        return self._enqueue(persist, filename, file_format, domain, sheets)
+
+    def submit_file(self, path: str, filename: str, file_format: str,
+                    domain: str, sheets: List[str] = None,
+                    job_id: str = None) -> Dict[str, Any]:
+        """
+        Queue a file already on local disk (moved, not copied)
+        With a caller-chosen job_id the call is idempotent: an existing job
+        is returned as is, and a file already moved by an attempt that
+        failed before queuing is picked up from its new place
+        """
+        if job_id is not None:
+            job = self.status(job_id)
+            if job is not None:
+                return job
+
+        def persist(file_path: Path):
+            if not os.path.exists(path) and file_path.exists():
+                return
+            os.replace(path, file_path)
+
+        return self._enqueue(persist, filename, file_format, domain, sheets, job_id)
+
+    def _enqueue(self, persist, filename: str, file_format: str,
+                 domain: str, sheets: List[str] = None,
+                 job_id: str = None) -> Dict[str, Any]:
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise OverflowError("Ingest queue is full, retry later")
+            self._pending += 1
+
+        try:
+            job_id = job_id or uuid.uuid4().hex
+            suffix = Path(filename or '').suffix
+            file_path = self.upload_dir / f"{job_id}{suffix}"
+            persist(file_path)
+
+            now = datetime.now().isoformat()
+            self.store.create({
+                'id': job_id,
+                'status': 'queued',
+                'domain': domain,
+                'filename': filename,
+                'file_format': file_format,
+                'file_path': str(file_path),
+                'sheets': json.dumps(sheets) if sheets else None,
+                'total_bytes': os.path.getsize(file_path),
+                'created_at': now,
+                'updated_at': now
+            })
+        except Exception:
+            with self._lock:
+                self._pending -= 1
+            raise
+
+        self._dispatch(job_id)
+        return self.status(job_id)
+
+    def status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Public job view with progress fraction and ETA"""
+        job = self.store.get(job_id)
+        if job is None:
+            return None
+
+        progress = (job['bytes_processed'] / job['total_bytes']
+                    if job['total_bytes'] else 0.0)
+        if job['status'] == 'completed':
+            progress = 1.0
+
+        eta_seconds = None
+        if job['status'] == 'running' and job['started_at'] and 0 < progress < 1:
+            elapsed = (datetime.now() -
+                       datetime.fromisoformat(job['started_at'])).total_seconds()
+            eta_seconds = round(elapsed * (1 - progress) / progress, 1)
+
+        return {
+            'job_id': job['id'],
+            'status': job['status'],
+            'domain': job['domain'],
+            'filename': job['filename'],
+            'file_format': job['file_format'],
+            'sheets': job['sheets'],
+            'rows_processed': job['rows_processed'],
+            'chunks_committed': job['chunks_committed'],
+            'bytes_processed': job['bytes_processed'],
+            'total_bytes': job['total_bytes'],
+            'progress': round(min(progress, 1.0), 4),
+            'eta_seconds': eta_seconds,
+            'created_at': job['created_at'],
+            'started_at': job['started_at'],
+            'finished_at': job['finished_at'],
+            'result': job['result'],
+            'error': job['error']
+        }
+
+    def _dispatch(self, job_id: str, force: bool = False):
+        if force:
+            with self._lock:
+                self._pending += 1
+        self._executor.submit(self._run, job_id)
+
+    def _run(self, job_id: str):
+        job = self.store.get(job_id)
+        try:
+            # Jobs interrupted by a crash resume after their last committed chunk
+            resume_chunk = job['chunks_committed']
+            self.store.update(job_id, status='running',
+                              started_at=job['started_at'] or datetime.now().isoformat())
+            started = time.perf_counter()
+
+            with open(job['file_path'], 'rb') as source:
+                def checkpoint(rows: int, chunks: int):
+                    self.store.update(job_id, rows_processed=rows,
+                                      chunks_committed=chunks,
+                                      bytes_processed=source.tell())
+
+                summary = IngestService.ingest_upload(
+                    source, job['file_format'], job['domain'],
+                    job['filename'], progress=checkpoint,
+                    start_chunk=resume_chunk,
+                    sheets=job['sheets'])
+
+            summary['duration_seconds'] = round(time.perf_counter() - started, 3)
+            self.store.update(job_id, status='completed',
+                              rows_processed=summary.get('records_received', 0),
+                              bytes_processed=job['total_bytes'],
+                              finished_at=datetime.now().isoformat(),
+                              result=summary)
+            os.remove(job['file_path'])
+        except Exception as e:
+            logger.log_error(e, f"Ingest job {job_id} failed")
+            self.store.update(job_id, status='failed', error=str(e),
+                              finished_at=datetime.now().isoformat())
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+
+# Global ingest job queue
+ingest_jobs = IngestJobQueue(
+    IngestJobStore(settings.INGEST_JOB_DB_PATH),
+    upload_dir=settings.INGEST_UPLOAD_DIR,
+    workers=settings.INGEST_WORKERS,
+    max_pending=settings.INGEST_QUEUE_SIZE
+)
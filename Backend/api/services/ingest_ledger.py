@@ -0,0 +1,158 @@
+import hashlib
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, List, NamedTuple, Optional, Tuple
+import numpy as np
+import pandas as pd
+from config.settings import settings
+
+
+# Natural key of a department record; rows sharing it are the same record
+ROW_KEY_COLUMNS = ('timestamp', 'district', 'ward', 'service_type')
+
+
+class RowDiff(NamedTuple):
+    """
+    What to store from a chunk: rows to process with their key and row
+    hashes, plus the key hashes of changed records whose stored version is
+    superseded and the warehouse parts holding those versions (None when
+    some were stored before parts were recorded)
+    """
+    process: np.ndarray
+    key_hashes: np.ndarray
+    row_hashes: np.ndarray
+    superseded: np.ndarray
+    superseded_parts: Optional[List[str]]
+
+
+class IngestLedger:
+    """
+    Local record of what has already been ingested, per domain
+    Holds the SHA-256 of every ingested file and a 64-bit key hash ->
+    (row hash, warehouse part) map, so repeated exports only push new or
+    changed rows and a changed row's old version is found without a scan
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS ingested_files (
+                    domain TEXT NOT NULL,
+                    sha256 TEXT NOT NULL,
+                    filename TEXT,
+                    records INTEGER NOT NULL,
+                    ingested_at TEXT NOT NULL,
+                    PRIMARY KEY (domain, sha256)
+                )""")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS ingested_rows (
+                    domain TEXT NOT NULL,
+                    key_hash INTEGER NOT NULL,
+                    row_hash INTEGER NOT NULL,
+                    part TEXT,
+                    PRIMARY KEY (domain, key_hash)
+                ) WITHOUT ROWID""")
+            columns = [row[1] for row in conn.execute("PRAGMA table_info(ingested_rows)")]
+            if 'part' not in columns:
+                conn.execute("ALTER TABLE ingested_rows ADD COLUMN part TEXT")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    @staticmethod
+    def content_hash(source: BinaryIO) -> str:
+        """SHA-256 of a file object, read in blocks; rewinds the file"""
+        digest = hashlib.sha256()
+        source.seek(0)
+        for block in iter(lambda: source.read(1024 * 1024), b''):
+            digest.update(block)
+        source.seek(0)
+        return digest.hexdigest()
+
+    def find_file(self, domain: str, sha256: str) -> Optional[Dict[str, Any]]:
+        """Previous ingest of an identical file, if any"""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT filename, records, ingested_at FROM ingested_files "
+                "WHERE domain = ? AND sha256 = ?", (domain, sha256)).fetchone()
+        if row is None:
+            return None
+        return {'filename': row[0], 'records': row[1], 'ingested_at': row[2]}
+
+    def record_file(self, domain: str, sha256: str, filename: str, records: int):
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO ingested_files VALUES (?, ?, ?, ?, ?)",
+                (domain, sha256, filename, records, datetime.now().isoformat()))
+
+    def diff(self, domain: str, chunk: pd.DataFrame) -> RowDiff:
+        """
+        Split a chunk into new/changed rows vs rows already ingested unchanged
+        Files without the key columns are treated as all-new
+        """
+        key_columns = self._key_columns(chunk)
+        if key_columns is None:
+            empty = np.empty(0, dtype=np.int64)
+            return RowDiff(np.ones(len(chunk), dtype=bool), empty, empty, empty, [])
+
+        key_hashes = pd.util.hash_pandas_object(
+            chunk[key_columns], index=False).to_numpy().view(np.int64)
+        row_hashes = pd.util.hash_pandas_object(
+            chunk, index=False).to_numpy().view(np.int64)
+
+        known = self._lookup(domain, np.unique(key_hashes))
+        stored = pd.Series(key_hashes).map({key: row for key, (row, _) in known.items()})
+        process = ~(stored.to_numpy() == row_hashes)
+
+        # Within one file, only the last version of each record counts
+        last = ~pd.Series(key_hashes).duplicated(keep='last').to_numpy()
+        process &= last
+
+        superseded = key_hashes[process & stored.notna().to_numpy()]
+        parts = {known[key][1] for key in superseded.tolist()}
+        return RowDiff(process, key_hashes[process], row_hashes[process], superseded,
+                       None if None in parts else sorted(parts))
+
+    def remember(self, domain: str, key_hashes: np.ndarray, row_hashes: np.ndarray,
+                 part: str = None):
+        """Record processed rows and the warehouse part holding them (call after they are stored)"""
+        if len(key_hashes) == 0:
+            return
+        with self._lock, self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO ingested_rows VALUES (?, ?, ?, ?)",
+                zip([domain] * len(key_hashes), key_hashes.tolist(),
+                    row_hashes.tolist(), [part] * len(key_hashes)))
+
+    def _lookup(self, domain: str, key_hashes: np.ndarray) -> Dict[int, Tuple[int, Optional[str]]]:
+        """key hash -> (row hash, part) for the keys already ingested"""
+        known = {}
+        batch = settings.INGEST_LEDGER_LOOKUP_BATCH
+        with self._connect() as conn:
+            for start in range(0, len(key_hashes), batch):
+                keys = key_hashes[start:start + batch].tolist()
+                placeholders = ', '.join('?' for _ in keys)
+                known.update((key, (row, part)) for key, row, part in conn.execute(
+                    f"SELECT key_hash, row_hash, part FROM ingested_rows "
+                    f"WHERE domain = ? AND key_hash IN ({placeholders})",
+                    [domain, *keys]))
+        return known
+
+    @staticmethod
+    def _key_columns(chunk: pd.DataFrame):
+        """Actual column names for the row key (case-insensitive), or None"""
+        by_lower = {str(c).lower(): c for c in chunk.columns}
+        if not all(k in by_lower for k in ROW_KEY_COLUMNS):
+            return None
+        return [by_lower[k] for k in ROW_KEY_COLUMNS]
+
+
+# Global ingest ledger
+ingest_ledger = IngestLedger(settings.INGEST_LEDGER_PATH)
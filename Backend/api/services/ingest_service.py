@@ -0,0 +1,475 @@
+import hashlib
+import multiprocessing
+import os
+import re
+import shutil
+import tempfile
+import threading
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+import pandas as pd
+import openpyxl
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, Sequence
+from config.settings import settings
+from middleware.data_privacy import privacy_framework
+from middleware.pii_scanner import pii_scanner
+from services.warehouse import warehouse, ROW_KEY_COLUMN
+from services.ingest_ledger import ingest_ledger
+from services.data_profiler import DatasetProfile, profile_store
+from services.dashboard_stats import dashboard_stats
+from services.alert_board import alert_board
+from services.trend_rollups import trend_rollups
+
+
+# pyarrow's message for a CSV value that does not fit its column's type
+_CSV_CONVERSION_ERROR = re.compile(r"In CSV column #(\d+): .*CSV conversion error")
+
+SUPPORTED_FORMATS = ('excel', 'csv', 'parquet', 'arrow')
+
+_FORMAT_EXTENSIONS = {
+    '.xlsx': 'excel', '.xlsm': 'excel',
+    '.csv': 'csv', '.txt': 'csv',
+    '.parquet': 'parquet', '.pq': 'parquet',
+    '.arrow': 'arrow', '.feather': 'arrow', '.ipc': 'arrow',
+}
+
+
+class IngestService:
+    """
+    Streaming ingest for department uploads
+    Files are parsed in fixed-size row chunks; each chunk is anonymized and
+    processed before the next one is read, so memory stays bounded
+    """
+
+    @staticmethod
+    def detect_format(source: BinaryIO, filename: str = None) -> str:
+        """
+        Detect upload format from the file's magic bytes, then its extension
+        Anything unrecognised is treated as CSV text
+        """
+        head = source.read(8)
+        source.seek(0)
+
+        if head.startswith(b'PK\x03\x04'):
+            return 'excel'
+        if head.startswith(b'PAR1'):
+            return 'parquet'
+        if head.startswith(b'ARROW1') or head.startswith(b'\xff\xff\xff\xff'):
+            return 'arrow'
+
+        suffix = ('.' + filename.rsplit('.', 1)[-1].lower()
+                  if filename and '.' in filename else '')
+        return _FORMAT_EXTENSIONS.get(suffix, 'csv')
+
+    @staticmethod
+    def iter_chunks(source: BinaryIO, fmt: str, chunk_rows: int = None,
+                    sheets: Sequence[str] = None) -> Iterator[pd.DataFrame]:
+        """Yield row chunks from an upload of any supported format"""
+        if fmt == 'excel':
+            return IngestService.iter_excel_chunks(source, chunk_rows, sheets)
+
+        readers = {
+            'csv': IngestService.iter_csv_chunks,
+            'parquet': IngestService.iter_parquet_chunks,
+            'arrow': IngestService.iter_arrow_chunks,
+        }
+        if fmt not in readers:
+            raise ValueError(f"Unsupported upload format: {fmt}")
+        return readers[fmt](source, chunk_rows)
+
+    @staticmethod
+    def iter_csv_chunks(source: BinaryIO, chunk_rows: int = None) -> Iterator[pd.DataFrame]:
+        """
+        Stream a CSV with pyarrow's multithreaded parser and typed columns
+        Types are inferred from the first block, with columns that are still
+        all null there read as text. If a later block does not fit a type,
+        the file is reopened with that column widened (integers to float,
+        anything else to text) and streaming resumes after the rows already
+        yielded, so no chunk is lost or passed on twice
+        """
+        read_options = pa_csv.ReadOptions(block_size=settings.INGEST_CSV_BLOCK_BYTES)
+        column_types: Dict[str, pa.DataType] = {}
+        rows_yielded = 0
+
+        while True:
+            source.seek(0)
+            reader = pa_csv.open_csv(
+                source, read_options=read_options,
+                convert_options=pa_csv.ConvertOptions(column_types=column_types,
+                                                      strings_can_be_null=True))
+            untyped = {field.name: pa.string() for field in reader.schema
+                       if pa.types.is_null(field.type)}
+            if untyped:
+                column_types.update(untyped)
+                continue
+
+            try:
+                for chunk in IngestService._rebatch(
+                        _skip_rows(reader, rows_yielded), chunk_rows):
+                    yield chunk
+                    rows_yielded += len(chunk)
+                return
+            except pa.ArrowInvalid as e:
+                match = _CSV_CONVERSION_ERROR.match(str(e))
+                if match is None:
+                    raise
+                field = reader.schema.field(int(match.group(1)))
+                if pa.types.is_string(field.type):
+                    raise
+                column_types[field.name] = pa.float64() \
+                    if pa.types.is_integer(field.type) else pa.string()
+
+    @staticmethod
+    def iter_parquet_chunks(source: BinaryIO, chunk_rows: int = None) -> Iterator[pd.DataFrame]:
+        """Read Parquet row groups column-wise in record batches"""
+        chunk_rows = chunk_rows or settings.INGEST_CHUNK_ROWS
+        parquet_file = pq.ParquetFile(source)
+        return IngestService._rebatch(
+            parquet_file.iter_batches(batch_size=chunk_rows), chunk_rows)
+
+    @staticmethod
+    def iter_arrow_chunks(source: BinaryIO, chunk_rows: int = None) -> Iterator[pd.DataFrame]:
+        """Read an Arrow IPC file or stream batch by batch"""
+        try:
+            reader = pa.ipc.open_file(source)
+            batches = (reader.get_batch(i)
+                       for i in range(reader.num_record_batches))
+        except pa.ArrowInvalid:
+            source.seek(0)
+            batches = pa.ipc.open_stream(source)
+        return IngestService._rebatch(batches, chunk_rows)
+
+    @staticmethod
+    def iter_excel_chunks(source: BinaryIO, chunk_rows: int = None,
+                          sheets: Sequence[str] = None) -> Iterator[pd.DataFrame]:
+        """
+        Yield row chunks from every worksheet (or the named subset)
+        Rows carry a source_sheet column. With several sheets and more than
+        one worker, sheets are parsed in parallel processes and yielded in
+        workbook order
+        """
+        chunk_rows = chunk_rows or settings.INGEST_CHUNK_ROWS
+        workbook = openpyxl.load_workbook(source, read_only=True, data_only=True)
+        try:
+            names = IngestService._select_sheets(workbook.sheetnames, sheets)
+        finally:
+            workbook.close()
+        source.seek(0)
+
+        workers = min(len(names),
+                      settings.EXCEL_SHEET_WORKERS or os.cpu_count() or 1)
+        if workers <= 1:
+            return IngestService._iter_sheets_serial(source, names, chunk_rows)
+        return IngestService._iter_sheets_parallel(source, names, chunk_rows, workers)
+
+    @staticmethod
+    def _select_sheets(available: List[str], sheets: Sequence[str] = None) -> List[str]:
+        if not sheets:
+            return list(available)
+        missing = [name for name in sheets if name not in available]
+        if missing:
+            raise ValueError(f"Unknown worksheet(s): {', '.join(missing)}; "
+                             f"workbook has: {', '.join(available)}")
+        return [name for name in available if name in sheets]
+
+    @staticmethod
+    def _iter_sheets_serial(source: BinaryIO, names: List[str],
+                            chunk_rows: int) -> Iterator[pd.DataFrame]:
+        """Stream the selected sheets one after another in this process"""
+        workbook = openpyxl.load_workbook(source, read_only=True, data_only=True)
+        try:
+            for name in names:
+                yield from _iter_sheet_rows(workbook[name], chunk_rows)
+        finally:
+            workbook.close()
+
+    @staticmethod
+    def _iter_sheets_parallel(source: BinaryIO, names: List[str], chunk_rows: int,
+                              workers: int) -> Iterator[pd.DataFrame]:
+        """
+        Parse sheets in the worker pool, keeping at most `workers` sheets in
+        flight. Workers spill parsed chunks to a temporary directory (see
+        _read_sheet) and the chunks are loaded back one at a time, so memory
+        stays bounded by chunk_rows per process, as on the serial path
+        """
+        path, temporary = IngestService._local_path(source)
+        spill_dir = tempfile.mkdtemp(prefix="sheets-")
+        pending = []
+        try:
+            pool = _get_sheet_pool()
+            pending = [pool.submit(_read_sheet, path, name, chunk_rows, spill_dir)
+                       for name in names[:workers]]
+            queued = names[workers:]
+
+            while pending:
+                chunk_paths = pending.pop(0).result()
+                if queued:
+                    pending.append(pool.submit(
+                        _read_sheet, path, queued.pop(0), chunk_rows, spill_dir))
+                for chunk_path in chunk_paths:
+                    chunk = pd.read_pickle(chunk_path)
+                    os.remove(chunk_path)
+                    yield chunk
+        finally:
+            for future in pending:
+                future.cancel()
+            shutil.rmtree(spill_dir, ignore_errors=True)
+            if temporary:
+                os.remove(path)
+
+    @staticmethod
+    def _local_path(source: BinaryIO):
+        """Path worker processes can open; spooled uploads are copied to disk"""
+        name = getattr(source, 'name', None)
+        if isinstance(name, str) and os.path.isfile(name):
+            return name, False
+
+        with tempfile.NamedTemporaryFile(suffix='.xlsx', delete=False) as out:
+            source.seek(0)
+            shutil.copyfileobj(source, out, length=1024 * 1024)
+        source.seek(0)
+        return out.name, True
+
+    @staticmethod
+    def ingest_upload(source: BinaryIO, file_format: str, domain: str,
+                      filename: str = None,
+                      progress: Callable[[int, int], None] = None,
+                      start_chunk: int = 0,
+                      sheets: Sequence[str] = None) -> Dict[str, Any]:
+        """
+        Ingest an uploaded file, skipping work already done
+        Byte-identical files are skipped outright; otherwise only rows that
+        are new or changed since earlier uploads go through the pipeline.
+        start_chunk resumes after chunks committed by an interrupted run;
+        sheets limits an Excel upload to the named worksheets
+        """
+        domain = domain.lower()
+        file_hash = ingest_ledger.content_hash(source)
+        if sheets:
+            # A different sheet selection of the same workbook is new data
+            file_hash = f"{file_hash}:{','.join(sorted(sheets))}"
+        previous = ingest_ledger.find_file(domain, file_hash)
+        if previous is not None:
+            return {
+                "records_processed": 0,
+                "rows_skipped": previous["records"],
+                "duplicate_file": True,
+                "previously_ingested_at": previous["ingested_at"],
+                "columns_detected": [],
+                "pii_masked": {},
+                "profile": None
+            }
+
+        summary = IngestService.ingest(
+            IngestService.iter_chunks(source, file_format, sheets=sheets),
+            domain, progress, start_chunk)
+        ingest_ledger.record_file(domain, file_hash, filename,
+                                  summary["records_received"])
+        profile_store.save(domain, summary["profile"], filename)
+        dashboard_stats.record_upload(domain, summary["records_processed"])
+        if domain == settings.ALERT_BOARD_DOMAIN and summary["records_processed"]:
+            alert_board.request_refresh()
+        summary["duplicate_file"] = False
+        return summary
+
+    @staticmethod
+    def ingest(chunks: Iterator[pd.DataFrame], domain: str,
+               progress: Callable[[int, int], None] = None,
+               start_chunk: int = 0) -> Dict[str, Any]:
+        """
+        Anonymize and process chunks as they arrive; return an ingest summary
+        Rows already ingested unchanged (same timestamp/district/ward/
+        service_type and values) are skipped; a changed row replaces its
+        stored version. progress, if given, is called
+        with (rows read, chunks committed) after each chunk is stored, which
+        makes it a checkpoint; chunks before start_chunk are only counted and
+        scanned for PII.
+        Per-column data-quality statistics are gathered in the same pass, and
+        PII found inside free-text columns is masked before storage
+        """
+        domain = domain.lower()
+        records_received = 0
+        records_processed = 0
+        records_resumed = 0
+        columns: List[str] = []
+        ingest_date = date.today()
+        profile = DatasetProfile()
+        pii_columns: Dict[str, List[str]] = {}
+        pii_cells_masked: Dict[str, int] = {}
+
+        for index, chunk in enumerate(chunks):
+            if not columns:
+                columns = list(chunk.columns)
+            records_received += len(chunk)
+
+            # Free-text PII under arbitrary headers (sampled detection). Runs
+            # on resumed chunks too, so later chunks mask the same columns
+            plan = privacy_framework.compile_plan(chunk.columns)
+            if settings.PII_SCAN_ENABLED:
+                known = plan.hash_fields + plan.drop_fields + tuple(pii_columns)
+                for name, kinds in pii_scanner.detect(chunk, skip=known).items():
+                    pii_columns[name] = kinds
+
+            if index < start_chunk:
+                records_resumed += len(chunk)
+                continue
+
+            # Profile raw values; PII columns are counted but never listed
+            profile.update(chunk.drop(columns=list(plan.drop_fields)),
+                           redact=plan.hash_fields + tuple(pii_columns))
+
+            process, key_hashes, row_hashes, superseded, superseded_parts = \
+                ingest_ledger.diff(domain, chunk)
+            delta = chunk[process]
+
+            if len(delta):
+                if pii_columns:
+                    delta, masked = pii_scanner.mask(delta, pii_columns)
+                    for name, cells in masked.items():
+                        pii_cells_masked[name] = pii_cells_masked.get(name, 0) + cells
+                anonymized = privacy_framework.anonymize_frame_parallel(delta)
+                if len(key_hashes):
+                    anonymized[ROW_KEY_COLUMN] = key_hashes
+
+                # A changed record replaces its stored version
+                part = uuid.uuid4().hex
+                with trend_rollups.folding():
+                    trend_rollups.retract(domain, warehouse.delete_keys(
+                        domain, superseded, superseded_parts))
+                    warehouse.append(domain, anonymized, ingest_date, part)
+                    trend_rollups.add(domain, anonymized)
+                ingest_ledger.remember(domain, key_hashes, row_hashes, part)
+                records_processed += len(anonymized)
+
+            if progress is not None:
+                progress(records_received, index + 1)
+
+        return {
+            "resumed_from_chunk": start_chunk,
+            "records_received": records_received,
+            "records_processed": records_processed,
+            "rows_skipped": records_received - records_resumed - records_processed,
+            "columns_detected": columns,
+            "pii_masked": {
+                name: {"types": kinds, "cells_masked": pii_cells_masked.get(name, 0)}
+                for name, kinds in pii_columns.items()
+            },
+            "profile": profile.to_dict()
+        }
+
+    @staticmethod
+    def _rebatch(batches: Iterable[pa.RecordBatch], chunk_rows: int = None) -> Iterator[pd.DataFrame]:
+        """Group Arrow record batches into DataFrames of about chunk_rows rows"""
+        chunk_rows = chunk_rows or settings.INGEST_CHUNK_ROWS
+        pending, pending_rows = [], 0
+
+        for batch in batches:
+            pending.append(batch)
+            pending_rows += batch.num_rows
+            if pending_rows >= chunk_rows:
+                yield IngestService._to_pandas(pending)
+                pending, pending_rows = [], 0
+
+        if pending_rows:
+            yield IngestService._to_pandas(pending)
+
+    @staticmethod
+    def _to_pandas(batches: List[pa.RecordBatch]) -> pd.DataFrame:
+        """Arrow batches -> DataFrame, avoiding copies where column types allow"""
+        table = pa.Table.from_batches(batches)
+        return table.to_pandas(split_blocks=True, self_destruct=True)
+
+    @staticmethod
+    def _column_names(header: tuple) -> List[str]:
+        """Header row -> column names, naming blanks like pandas does"""
+        return [str(name) if name is not None else f"Unnamed: {i}"
+                for i, name in enumerate(header)]
+
+
+def _iter_sheet_rows(worksheet, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    """Row chunks from one read-only worksheet, tagged with source_sheet"""
+    rows = worksheet.iter_rows(values_only=True)
+    header = next(rows, None)
+    if header is None:
+        return
+    columns = IngestService._column_names(header)
+
+    def frame(records):
+        chunk = pd.DataFrame.from_records(records, columns=columns)
+        chunk['source_sheet'] = worksheet.title
+        return chunk
+
+    buffer = []
+    for row in rows:
+        # read-only sheets can report trailing blank rows
+        if all(value is None for value in row):
+            continue
+        buffer.append(row[:len(columns)])
+        if len(buffer) >= chunk_rows:
+            yield frame(buffer)
+            buffer = []
+
+    if buffer:
+        yield frame(buffer)
+
+
+def _skip_rows(batches: Iterable[pa.RecordBatch], rows: int) -> Iterator[pa.RecordBatch]:
+    """Record batches with the first `rows` rows left out"""
+    for batch in batches:
+        if rows >= batch.num_rows:
+            rows -= batch.num_rows
+            continue
+        yield batch.slice(rows) if rows else batch
+        rows = 0
+
+
+def _read_sheet(path: str, sheet_name: str, chunk_rows: int, spill_dir: str) -> List[str]:
+    """
+    Process-pool entry point: parse one worksheet chunk by chunk
+    Each chunk is pickled to its own file under spill_dir as soon as it is
+    parsed, and only the file paths go back to the parent, so neither
+    process ever holds more than one chunk of the sheet
+    """
+    prefix = hashlib.sha256(sheet_name.encode()).hexdigest()[:16]
+    paths = []
+    workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        for index, chunk in enumerate(_iter_sheet_rows(workbook[sheet_name], chunk_rows)):
+            chunk_path = os.path.join(spill_dir, f"{prefix}-{index:06d}.pkl")
+            chunk.to_pickle(chunk_path)
+            paths.append(chunk_path)
+    finally:
+        workbook.close()
+    return paths
+
+
+_sheet_pool = None
+_sheet_pool_lock = threading.Lock()
+
+
+def _get_sheet_pool() -> ProcessPoolExecutor:
+    """
+    Lazily create the worksheet parsing pool (reused across uploads)
+    Workers come from a forkserver: forking the threaded server process
+    itself could copy locks held by other threads
+    """
+    global _sheet_pool
+    with _sheet_pool_lock:
+        if _sheet_pool is None:
+            _sheet_pool = ProcessPoolExecutor(
+                max_workers=settings.EXCEL_SHEET_WORKERS or os.cpu_count() or 1,
+                mp_context=multiprocessing.get_context("forkserver"))
+        return _sheet_pool
+
+
+def shutdown_sheet_pool():
+    """Release the worksheet parsing processes"""
+    global _sheet_pool
+    with _sheet_pool_lock:
+        if _sheet_pool is not None:
+            _sheet_pool.shutdown()
+            _sheet_pool = None
@@ -0,0 +1,259 @@
+import base64
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import date
+from typing import Any, Dict, List, NamedTuple, Optional
+import numpy as np
+import pyarrow.csv as pa_csv
+from config.settings import settings
+
+
+# Columns that can be filtered on with equality (dictionary-encoded)
+FILTER_COLUMNS = ('domain', 'district', 'issue_type')
+
+SORTS = ('rank', 'timestamp', '-timestamp')
+
+
+class _IndexState(NamedTuple):
+    version: str
+    columns: Dict[str, np.ndarray]
+    categories: Dict[str, Dict[str, int]]
+    codes: Dict[str, np.ndarray]
+    day_numbers: np.ndarray
+    orders: Dict[str, np.ndarray]
+    postings: Dict[tuple, Dict[int, np.ndarray]]
+
+
+class PriorityIssueIndex:
+    """
+    In-memory columnar index over the ranked priority issues
+    Columns are held as NumPy arrays (categoricals as integer codes). For
+    every sort order there is a full row ordering plus, per filter value, a
+    posting list of row ids already in that order. A query walks the
+    shortest matching posting list from the cursor position and checks the
+    remaining predicates vectorized, block by block, until the page is full,
+    so the work depends on the page size, not the row count
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._load_lock = threading.Lock()
+        self._state: Optional[_IndexState] = None
+        self._mtime = None
+        self._checked_at = 0.0
+
+    @property
+    def rows(self) -> int:
+        return len(self._state.day_numbers) if self._state else 0
+
+    # Loading
+
+    def load(self):
+        """(Re)build the index from the ranked issues CSV"""
+        mtime = os.path.getmtime(self.path)
+        table = pa_csv.read_csv(self.path)
+
+        columns = {}
+        categories = {}
+        codes = {}
+        for name in table.column_names:
+            column = table[name].combine_chunks()
+            if name in FILTER_COLUMNS:
+                encoded = column.dictionary_encode()
+                categories[name] = {value: code for code, value in
+                                    enumerate(encoded.dictionary.to_pylist())}
+                codes[name] = encoded.indices.to_numpy().astype(np.int32)
+            columns[name] = column.to_numpy(zero_copy_only=False)
+
+        timestamps = columns['timestamp'].astype('datetime64[D]')
+        columns['timestamp'] = timestamps
+        day_numbers = timestamps.astype(np.int64)
+
+        orders = {
+            'rank': np.argsort(columns['rank'], kind='stable').astype(np.int32),
+            'timestamp': np.argsort(day_numbers, kind='stable').astype(np.int32),
+        }
+        orders['-timestamp'] = np.argsort(-day_numbers, kind='stable').astype(np.int32)
+
+        postings = {}
+        for sort, order in orders.items():
+            for name, column_codes in codes.items():
+                postings[(sort, name)] = self._posting_lists(order, column_codes[order])
+
+        # Swapped in as one object so queries never mix two loads
+        self._state = _IndexState(
+            version=f"{mtime}:{len(day_numbers)}", columns=columns,
+            categories=categories, codes=codes, day_numbers=day_numbers,
+            orders=orders, postings=postings)
+        self._mtime = mtime
+
+    @staticmethod
+    def _posting_lists(order: np.ndarray, ordered_codes: np.ndarray) -> Dict[int, np.ndarray]:
+        """code -> row ids with that code, keeping the given order"""
+        grouping = np.argsort(ordered_codes, kind='stable')
+        grouped_codes = ordered_codes[grouping]
+        boundaries = np.flatnonzero(np.diff(grouped_codes)) + 1
+        return {int(block_codes[0]): order[block]
+                for block, block_codes in zip(np.split(grouping, boundaries),
+                                              np.split(grouped_codes, boundaries))
+                if len(block)}
+
+    def reload_due(self) -> bool:
+        """True when ensure_current should run (cheap; no filesystem access)"""
+        return self._state is None or time.monotonic() - self._checked_at >= \
+            settings.PRIORITY_ISSUES_RELOAD_CHECK_SECONDS
+
+    def ensure_current(self):
+        """Load on first use; reload when the CSV has been rewritten"""
+        with self._load_lock:
+            self._checked_at = time.monotonic()
+            if self._state is None or os.path.getmtime(self.path) != self._mtime:
+                self.load()
+
+    # Querying
+
+    def query(self, filters: Dict[str, str] = None, start_date: date = None,
+              end_date: date = None, sort: str = 'rank', limit: int = 50,
+              cursor: str = None, include_total: bool = False) -> Dict[str, Any]:
+        """One page of matching issues plus the cursor for the next page"""
+        if sort not in SORTS:
+            raise ValueError(f"sort must be one of {list(SORTS)}")
+        if self._state is None:
+            self.ensure_current()
+        state = self._state
+
+        filters = {name: value for name, value in (filters or {}).items()
+                   if value is not None}
+        fingerprint = self._fingerprint(state, filters, start_date, end_date, sort)
+        position = self._decode_cursor(cursor, fingerprint) if cursor else 0
+
+        # Shortest posting list drives the scan; other predicates are checks
+        candidates = state.orders[sort]
+        matched = []
+        for name, value in filters.items():
+            code = state.categories[name].get(value)
+            posting = state.postings[(sort, name)].get(code) if code is not None else None
+            if posting is None:
+                return self._page([], None, 0 if include_total else None)
+            matched.append((len(posting), name, code, posting))
+
+        checks = []
+        if matched:
+            matched.sort(key=lambda entry: entry[0])
+            candidates = matched[0][3]
+            checks = [self._code_check(state, name, code)
+                      for _, name, code, _ in matched[1:]]
+
+        if start_date is not None or end_date is not None:
+            low = np.datetime64(start_date, 'D').astype(np.int64) if start_date else None
+            high = np.datetime64(end_date, 'D').astype(np.int64) if end_date else None
+            checks.append(self._range_check(state, low, high))
+
+        selected, next_position = self._scan(candidates, checks, position, limit)
+        total = None
+        if include_total:
+            total = len(candidates) if not checks else \
+                int(self._matches(candidates, checks).sum())
+
+        next_cursor = self._encode_cursor(next_position, fingerprint) \
+            if next_position is not None else None
+        return self._page(self._records(state, selected), next_cursor, total)
+
+    def _scan(self, candidates: np.ndarray, checks: list, position: int, limit: int):
+        """Collect up to limit matching row ids starting at position"""
+        if not checks:
+            selected = candidates[position:position + limit]
+            end = position + len(selected)
+            return selected, end if end < len(candidates) else None
+
+        selected = []
+        found = 0
+        block = max(limit * 4, 256)
+        while position < len(candidates) and found < limit:
+            rows = candidates[position:position + block]
+            hits = np.flatnonzero(self._matches(rows, checks))
+            if found + len(hits) > limit:
+                hits = hits[:limit - found]
+                position += int(hits[-1]) + 1
+                selected.append(rows[hits])
+                found = limit
+                break
+            selected.append(rows[hits])
+            found += len(hits)
+            position += len(rows)
+            block *= 2
+
+        selected = np.concatenate(selected) if selected else np.empty(0, np.int32)
+        return selected, position if position < len(candidates) else None
+
+    @staticmethod
+    def _matches(rows: np.ndarray, checks: list) -> np.ndarray:
+        mask = np.ones(len(rows), dtype=bool)
+        for check in checks:
+            mask &= check(rows)
+        return mask
+
+    @staticmethod
+    def _code_check(state, name: str, code: int):
+        column_codes = state.codes[name]
+        return lambda rows: column_codes[rows] == code
+
+    @staticmethod
+    def _range_check(state, low: Optional[int], high: Optional[int]):
+        days = state.day_numbers
+
+        def check(rows):
+            values = days[rows]
+            mask = np.ones(len(rows), dtype=bool)
+            if low is not None:
+                mask &= values >= low
+            if high is not None:
+                mask &= values <= high
+            return mask
+        return check
+
+    @staticmethod
+    def _records(state, rows: np.ndarray) -> List[Dict[str, Any]]:
+        names = list(state.columns)
+        values = [state.columns[name][rows].tolist() for name in names]
+        timestamp_index = names.index('timestamp')
+        values[timestamp_index] = [day.isoformat() for day in values[timestamp_index]]
+        return [dict(zip(names, row)) for row in zip(*values)]
+
+    @staticmethod
+    def _page(issues: list, next_cursor: Optional[str], total: Optional[int]) -> Dict[str, Any]:
+        page = {"issues": issues, "count": len(issues), "next_cursor": next_cursor}
+        if total is not None:
+            page["total"] = total
+        return page
+
+    # Cursors
+
+    @staticmethod
+    def _fingerprint(state, filters, start_date, end_date, sort) -> str:
+        key = json.dumps([state.version, sorted(filters.items()), str(start_date),
+                          str(end_date), sort])
+        return hashlib.sha256(key.encode()).hexdigest()[:12]
+
+    @staticmethod
+    def _encode_cursor(position: int, fingerprint: str) -> str:
+        raw = json.dumps({"p": position, "q": fingerprint}, separators=(",", ":"))
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+    @staticmethod
+    def _decode_cursor(cursor: str, fingerprint: str) -> int:
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            state = json.loads(raw)
+            position = int(state["p"])
+        except (ValueError, KeyError, TypeError):
+            raise ValueError("Invalid cursor")
+        if state.get("q") != fingerprint or position < 0:
+            raise ValueError("Cursor does not match this query (or the data was reloaded)")
+        return position
+
+
+priority_issues = PriorityIssueIndex(settings.PRIORITY_ISSUES_PATH)
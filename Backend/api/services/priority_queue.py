@@ -0,0 +1,146 @@
+import heapq
+import itertools
+from typing import Any, Dict, List, Optional
+from config.settings import settings
+from utils.periodic_snapshot import PeriodicSnapshot
+
+
+def issue_key(domain: str, district: str, issue_type: str) -> str:
+    """Stable identity of a live issue; rescoring the same issue replaces it"""
+    return f"{domain}|{district}|{issue_type}"
+
+
+class _RankedHeap:
+    """
+    Max-heap of issue keys by score with lazy deletion
+    Updates push a new (score, seq) entry in O(log n); superseded entries
+    are skipped when they surface and compacted away once they dominate
+    """
+
+    __slots__ = ('heap', 'live')
+
+    def __init__(self):
+        self.heap = []
+        self.live: Dict[str, int] = {}  # key -> seq of its current entry
+
+    def push(self, key: str, score: float, seq: int):
+        self.live[key] = seq
+        heapq.heappush(self.heap, (-score, seq, key))
+        self._maybe_compact()
+
+    def remove(self, key: str):
+        self.live.pop(key, None)
+        self._maybe_compact()
+
+    def top(self, k: int) -> List[str]:
+        """Keys of the k best live entries; O(k log n), heap left intact"""
+        popped, keys = [], []
+        while self.heap and len(keys) < k:
+            entry = heapq.heappop(self.heap)
+            if self.live.get(entry[2]) == entry[1]:
+                keys.append(entry[2])
+                popped.append(entry)
+        for entry in popped:
+            heapq.heappush(self.heap, entry)
+        return keys
+
+    def _maybe_compact(self):
+        if len(self.heap) > 64 and len(self.heap) > 2 * len(self.live):
+            self.heap = [entry for entry in self.heap
+                         if self.live.get(entry[2]) == entry[1]]
+            heapq.heapify(self.heap)
+
+
+class LivePriorityQueue(PeriodicSnapshot):
+    """
+    Continuously current ranking of scored issues
+    Every priority calculation upserts its issue into a statewide heap and
+    its district's heap; resolving an issue removes it. Top-K reads pop and
+    restore K entries instead of re-sorting everything. At most max_issues
+    stay live: past that, the lowest-scored issue is evicted (issue_type is
+    caller-supplied text, so the key space is unbounded). State is
+    snapshotted to disk periodically and restored on startup
+    """
+
+    snapshot_name = "priority-queue"
+    snapshot_label = "Priority queue"
+
+    def __init__(self, path: str, persist_interval: float, max_issues: int):
+        super().__init__(path, persist_interval)
+        self.max_issues = max_issues
+        self._seq = itertools.count()
+        self._issues: Dict[str, Dict[str, Any]] = {}
+        self._statewide = _RankedHeap()
+        self._lowest = _RankedHeap()  # negated scores: lowest issue on top
+        self._districts: Dict[str, _RankedHeap] = {}
+
+    def __len__(self) -> int:
+        return len(self._issues)
+
+    def upsert(self, issue: Dict[str, Any]) -> str:
+        """Add or rescore an issue (needs domain, district, issue_type, priority_score)"""
+        key = issue_key(issue['domain'], issue['district'], issue['issue_type'])
+        with self._lock:
+            self._upsert(key, issue)
+            self._dirty = True
+        return key
+
+    def _upsert(self, key: str, issue: Dict[str, Any]):
+        previous = self._issues.get(key)
+        if previous is not None and previous['district'] != issue['district']:
+            self._districts[previous['district']].remove(key)
+
+        seq = next(self._seq)
+        self._issues[key] = {**issue, 'issue_key': key}
+        self._statewide.push(key, issue['priority_score'], seq)
+        self._lowest.push(key, -issue['priority_score'], seq)
+        self._districts.setdefault(issue['district'], _RankedHeap()) \
+            .push(key, issue['priority_score'], seq)
+
+        while len(self._issues) > self.max_issues:
+            self._remove(self._lowest.top(1)[0])
+
+    def resolve(self, key: str) -> Optional[Dict[str, Any]]:
+        """Remove a resolved issue; returns it, or None if unknown"""
+        with self._lock:
+            issue = self._remove(key)
+            if issue is not None:
+                self._dirty = True
+        return issue
+
+    def _remove(self, key: str) -> Optional[Dict[str, Any]]:
+        issue = self._issues.pop(key, None)
+        if issue is None:
+            return None
+        self._statewide.remove(key)
+        self._lowest.remove(key)
+        district = self._districts.get(issue['district'])
+        if district is not None:
+            district.remove(key)
+            if not district.live:
+                del self._districts[issue['district']]
+        return issue
+
+    def top(self, k: int, district: str = None) -> List[Dict[str, Any]]:
+        """Highest-priority live issues, statewide or for one district"""
+        with self._lock:
+            heap = self._districts.get(district) if district else self._statewide
+            if heap is None:
+                return []
+            return [self._issues[key] for key in heap.top(k)]
+
+    # Persistence
+
+    def _snapshot_state(self) -> Dict[str, Any]:
+        return {'issues': list(self._issues.values())}
+
+    def _restore_state(self, state: Dict[str, Any]):
+        with self._lock:
+            for issue in state.get('issues', []):
+                self._upsert(issue['issue_key'], issue)
+
+
+priority_queue = LivePriorityQueue(
+    settings.PRIORITY_QUEUE_PATH,
+    persist_interval=settings.PRIORITY_QUEUE_PERSIST_SECONDS,
+    max_issues=settings.PRIORITY_QUEUE_MAX_ISSUES)
@@ -0,0 +1,297 @@
+import threading
+from bisect import bisect_left, bisect_right
+from contextlib import contextmanager
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import numpy as np
+import pandas as pd
+from config.settings import settings
+from services.warehouse import warehouse
+from utils.periodic_snapshot import PeriodicSnapshot
+
+
+GRANULARITIES = ('day', 'week', 'month')
+
+# Demand measure per domain layout (first column present wins)
+DEMAND_COLUMNS = ('demand_requests', 'incidents_reported')
+
+KEY_COLUMNS = ('timestamp', 'district', 'service_type')
+
+# Stands for "all values" in a rollup key
+ALL = '*'
+
+
+def _bucket(granularity: str, days: np.ndarray) -> np.ndarray:
+    """Epoch-day numbers -> bucket numbers (epoch day, week-start day, epoch month)"""
+    if granularity == 'day':
+        return days
+    if granularity == 'week':
+        # 1970-01-01 was a Thursday; weeks start on Monday
+        return days - (days + 3) % 7
+    return days.astype('datetime64[D]').astype('datetime64[M]').astype(np.int64)
+
+
+def _bucket_starts(granularity: str, buckets: List[int]) -> List[str]:
+    """Bucket numbers -> ISO dates of the first day of each period"""
+    unit = 'datetime64[M]' if granularity == 'month' else 'datetime64[D]'
+    return np.array(buckets, dtype=np.int64).astype(unit) \
+        .astype('datetime64[D]').astype(str).tolist()
+
+
+class _Series:
+    """Buckets of one rollup key: bucket -> [demand, records], plus sorted keys"""
+
+    __slots__ = ('buckets', '_keys')
+
+    def __init__(self):
+        self.buckets: Dict[int, list] = {}
+        self._keys: Optional[List[int]] = []
+
+    def add(self, bucket: int, demand: float, records: int):
+        entry = self.buckets.get(bucket)
+        if entry is None:
+            if records <= 0:
+                return  # nothing here to retract
+            self.buckets[bucket] = [demand, records]
+            if self._keys is not None:
+                if self._keys and bucket < self._keys[-1]:
+                    self._keys = None  # out of order; re-sorted on next read
+                else:
+                    self._keys.append(bucket)
+        else:
+            entry[0] += demand
+            entry[1] += records
+            if entry[1] <= 0:
+                # Every row of the bucket was retracted
+                del self.buckets[bucket]
+                if self._keys is not None:
+                    self._keys.remove(bucket)
+
+    def range(self, low: Optional[int], high: Optional[int]) -> List[int]:
+        if self._keys is None:
+            self._keys = sorted(self.buckets)
+        keys = self._keys
+        start = bisect_left(keys, low) if low is not None else 0
+        end = bisect_right(keys, high) if high is not None else len(keys)
+        return keys[start:end]
+
+
+class TrendRollups(PeriodicSnapshot):
+    """
+    Materialized demand rollups behind /dashboard/trends
+    Demand is summed per domain x district x service_type x day, week and
+    month, with "*" keys for every combination of "all domains/districts/
+    service types", so any chart is a range read of one series. Ingested
+    chunks are folded in as they are stored, and the stored versions they
+    supersede are retracted.
+
+    With nothing ingested yet the rollups are seeded from the bundled
+    sample data, which the first ingest discards, so sample and ingested
+    rows are never counted together. A daemon thread snapshots the rollups
+    with a fingerprint of the warehouse they reflect; start() restores the
+    snapshot only if the warehouse still matches it and rebuilds otherwise
+    (e.g. after a crash between an ingest and the next snapshot)
+    """
+
+    snapshot_name = "trend-rollups"
+    snapshot_label = "Trend rollups"
+
+    def __init__(self, path: str, persist_interval: float):
+        super().__init__(path, persist_interval)
+        self.version = 0
+        self.seeded = False
+        # Held across a warehouse change and its fold, and while snapshotting
+        self._fold_lock = threading.Lock()
+        self._warehouse_state = None
+        self._series: Dict[tuple, _Series] = {}
+
+    # Updating
+
+    @contextmanager
+    def folding(self):
+        """
+        Hold while changing the warehouse and folding the change in, so a
+        snapshot never pairs the rollups with a warehouse they do not match
+        """
+        with self._fold_lock:
+            yield
+
+    def add(self, domain: str, df: pd.DataFrame) -> int:
+        """Fold rows of one domain into the rollups; returns rows counted"""
+        return self._fold(domain, df, 1)
+
+    def retract(self, domain: str, df: pd.DataFrame) -> int:
+        """Take back rows added earlier (e.g. superseded versions of a record)"""
+        return self._fold(domain, df, -1)
+
+    def _fold(self, domain: str, df: pd.DataFrame, sign: int) -> int:
+        demand_column = next((c for c in DEMAND_COLUMNS if c in df), None)
+        if demand_column is None or any(c not in df for c in KEY_COLUMNS):
+            return 0
+
+        days = pd.to_datetime(df['timestamp'], errors='coerce')
+        rows = pd.DataFrame({
+            'district': df['district'],
+            'service_type': df['service_type'],
+            'day': days.values.astype('datetime64[D]').astype(np.int64),
+            'demand': pd.to_numeric(df[demand_column], errors='coerce').fillna(0)
+        })[days.notna().values & df['district'].notna().values &
+           df['service_type'].notna().values]
+        if rows.empty:
+            return 0
+
+        daily = rows.groupby(['district', 'service_type', 'day'], sort=False) \
+            .agg(demand=('demand', 'sum'), records=('demand', 'size')).reset_index()
+
+        updates = []
+        for granularity in GRANULARITIES:
+            grouped = daily.assign(bucket=_bucket(granularity, daily['day'].to_numpy()))
+            for keys in (['district', 'service_type'], ['district'],
+                         ['service_type'], []):
+                totals = grouped.groupby(keys + ['bucket'], sort=False)[
+                    ['demand', 'records']].sum().reset_index()
+                district = totals['district'] if 'district' in keys else ALL
+                service_type = totals['service_type'] if 'service_type' in keys else ALL
+                updates.append((granularity, district, service_type, totals))
+
+        domain = domain.lower()
+        with self._lock:
+            if self.seeded:
+                # First ingest: the sample data is not in the warehouse
+                self._series = {}
+                self.seeded = False
+            for granularity, district, service_type, totals in updates:
+                districts = district.tolist() if isinstance(district, pd.Series) \
+                    else [district] * len(totals)
+                service_types = service_type.tolist() \
+                    if isinstance(service_type, pd.Series) else [service_type] * len(totals)
+                for d, s, bucket, demand, records in zip(
+                        districts, service_types, totals['bucket'].tolist(),
+                        totals['demand'].tolist(), totals['records'].tolist()):
+                    for domain_key in (domain, ALL):
+                        self._get_series((granularity, domain_key, d, s)) \
+                            .add(bucket, sign * demand, sign * records)
+            self._changed()
+        return len(rows)
+
+    def _get_series(self, key: tuple) -> _Series:
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = _Series()
+        return series
+
+    def _changed(self):
+        self._dirty = True
+        self.version += 1
+
+    # Reading
+
+    def query(self, granularity: str = 'day', domain: str = None,
+              district: str = None, service_type: str = None,
+              start_date: date = None, end_date: date = None) -> List[Dict[str, Any]]:
+        """Demand per period for one domain/district/service_type selection"""
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"granularity must be one of {list(GRANULARITIES)}")
+
+        key = (granularity, domain.lower() if domain else ALL,
+               district or ALL, service_type or ALL)
+        low = self._date_bucket(granularity, start_date)
+        high = self._date_bucket(granularity, end_date)
+
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                return []
+            buckets = series.range(low, high)
+            values = [tuple(series.buckets[bucket]) for bucket in buckets]
+
+        return [{
+            "period": period,
+            "demand": round(demand, 2),
+            "records": records,
+            "average_demand": round(demand / records, 2) if records else None
+        } for period, (demand, records) in zip(_bucket_starts(granularity, buckets), values)]
+
+    @staticmethod
+    def _date_bucket(granularity: str, day: Optional[date]) -> Optional[int]:
+        if day is None:
+            return None
+        days = np.array([np.datetime64(day, 'D').astype(np.int64)])
+        return int(_bucket(granularity, days)[0])
+
+    # Building
+
+    def rebuild(self):
+        """
+        Recompute every rollup from the warehouse or, if nothing has been
+        ingested yet, from the bundled sample data
+        """
+        with self._fold_lock:
+            stored = {domain: self._load_stored(domain) for domain in settings.DOMAINS}
+            seeded = not any(len(rows) for rows in stored.values())
+            if seeded:
+                stored = {domain: pd.read_csv(path)
+                          for domain, path in settings.DOMAIN_DATA_PATHS.items()
+                          if Path(path).exists()}
+
+            with self._lock:
+                self._series = {}
+                self.seeded = False
+                self._changed()
+            for domain, rows in stored.items():
+                self.add(domain, rows)
+            with self._lock:
+                self.seeded = seeded
+
+    @staticmethod
+    def _load_stored(domain: str) -> pd.DataFrame:
+        """A domain's warehouse rows (rollup columns only)"""
+        for demand_column in DEMAND_COLUMNS:
+            try:
+                rows = warehouse.read(domain, columns=list(KEY_COLUMNS) + [demand_column])
+            except ValueError:
+                continue
+            if not rows.empty:
+                return rows
+        return pd.DataFrame()
+
+    # Persistence
+
+    def load(self):
+        """Restore the last snapshot if it matches the warehouse, else rebuild"""
+        state = self.read_snapshot()
+        if state is not None and state.get('warehouse') == warehouse.fingerprint():
+            self._restore_state(state)
+        else:
+            self.rebuild()
+
+    def persist(self):
+        # No ingest may change the warehouse between fingerprint and state
+        with self._fold_lock:
+            if self._dirty:
+                self._warehouse_state = warehouse.fingerprint()
+            super().persist()
+
+    def _snapshot_state(self) -> Dict[str, Any]:
+        return {
+            'warehouse': self._warehouse_state,
+            'seeded': self.seeded,
+            'series': [[*key, [[bucket, *entry] for bucket, entry in series.buckets.items()]]
+                       for key, series in self._series.items()]
+        }
+
+    def _restore_state(self, state: Dict[str, Any]):
+        with self._lock:
+            self._series = {}
+            self.seeded = state.get('seeded', False)
+            for granularity, domain, district, service_type, buckets in state.get('series', []):
+                series = self._get_series((granularity, domain, district, service_type))
+                for bucket, demand, records in buckets:
+                    series.add(bucket, demand, records)
+            self.version += 1
+
+
+trend_rollups = TrendRollups(
+    settings.TREND_ROLLUPS_PATH,
+    persist_interval=settings.TREND_ROLLUPS_PERSIST_SECONDS)
@@ -0,0 +1,220 @@
+import asyncio
+import json
+import os
+import shutil
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Tuple
+from fastapi.concurrency import run_in_threadpool
+from config.settings import settings
+from services.ingest_ledger import IngestLedger
+from utils.logger import logger
+
+
+class UploadOffsetMismatch(Exception):
+    """Append did not start at the session's acknowledged offset"""
+
+    def __init__(self, expected: int):
+        super().__init__(f"Expected offset {expected}")
+        self.expected = expected
+
+
+class UploadChecksumMismatch(Exception):
+    """Committed data does not match the client's SHA-256"""
+
+
+class UploadSessionStore:
+    """
+    Resumable chunked uploads checkpointed on local disk
+    Each session is a directory with the partial file and a small JSON
+    manifest; the manifest offset is only advanced after the appended bytes
+    are fsynced, so clients can always resume from the acknowledged offset.
+    Sessions not updated for ttl are deleted by a periodic sweep
+    """
+
+    def __init__(self, root: str, ttl: timedelta, sweep_interval: float):
+        self.root = Path(root)
+        self.ttl = ttl
+        self.sweep_interval = sweep_interval
+        self._locks = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def create(self, domain: str, filename: str,
+               total_bytes: Optional[int] = None) -> Dict[str, Any]:
+        session_id = uuid.uuid4().hex
+        session_dir = self.root / session_id
+        session_dir.mkdir(parents=True)
+        (session_dir / "data.part").touch()
+
+        manifest = {
+            'session_id': session_id,
+            'domain': domain,
+            'filename': filename,
+            'total_bytes': total_bytes,
+            'offset': 0,
+            'status': 'open',
+            'job_id': None,
+            'created_at': datetime.now().isoformat(),
+            'updated_at': datetime.now().isoformat()
+        }
+        self._write_manifest(session_id, manifest)
+        return manifest
+
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        path = self.root / session_id / "manifest.json"
+        if not session_id.isalnum() or not path.exists():
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    async def append(self, session_id: str, offset: int,
+                     body: AsyncIterator[bytes], max_bytes: int) -> Dict[str, Any]:
+        """
+        Append a request body at offset; returns the updated manifest
+        Bytes past the acknowledged offset (from an interrupted append) are
+        discarded before writing
+        """
+        async with self._lock(session_id):
+            manifest = self.get(session_id)
+            if manifest is None:
+                raise KeyError(session_id)
+            if manifest['status'] != 'open':
+                raise ValueError(f"Upload session is {manifest['status']}")
+            if offset != manifest['offset']:
+                raise UploadOffsetMismatch(manifest['offset'])
+
+            written = 0
+            f = await run_in_threadpool(open, self.data_path(session_id), 'r+b')
+            try:
+                f.seek(offset)
+                f.truncate()
+                async for block in body:
+                    written += len(block)
+                    if offset + written > max_bytes:
+                        f.truncate(offset)
+                        raise OverflowError(
+                            f"Upload exceeds the {max_bytes // (1024 * 1024)} MB limit")
+                    await run_in_threadpool(f.write, block)
+                f.flush()
+                await run_in_threadpool(os.fsync, f.fileno())
+            finally:
+                f.close()
+
+            manifest['offset'] = offset + written
+            manifest['updated_at'] = datetime.now().isoformat()
+            self._write_manifest(session_id, manifest)
+            return manifest
+
+    def data_path(self, session_id: str) -> Path:
+        return self.root / session_id / "data.part"
+
+    async def commit(self, session_id: str, submit: Callable[[Path, str], Dict[str, Any]],
+                     sha256: Optional[str] = None
+                     ) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+        """
+        Hand a finished upload to submit(data_path, job_id) exactly once
+        Runs under the session lock, so racing commits and appends
+        serialize. The session is marked committing, with its job id, before
+        submit moves the data file; a commit retried after a crash in between
+        reuses that job id, so submit must be idempotent for it. Returns
+        (manifest, job); job is None if the session was already committed
+        """
+        async with self._lock(session_id):
+            manifest = self.get(session_id)
+            if manifest is None:
+                raise KeyError(session_id)
+            if manifest['status'] == 'committed':
+                return manifest, None
+
+            if manifest['status'] == 'open':
+                if manifest['total_bytes'] is not None and \
+                        manifest['offset'] != manifest['total_bytes']:
+                    raise UploadOffsetMismatch(manifest['offset'])
+                if sha256 is not None:
+                    with open(self.data_path(session_id), 'rb') as f:
+                        actual = await run_in_threadpool(IngestLedger.content_hash, f)
+                    if actual != sha256.lower():
+                        raise UploadChecksumMismatch("Checksum mismatch")
+                self._update(session_id, manifest, status='committing',
+                             job_id=uuid.uuid4().hex)
+
+            job = await run_in_threadpool(
+                submit, self.data_path(session_id), manifest['job_id'])
+            self._update(session_id, manifest, status='committed')
+            return manifest, job
+
+    def delete(self, session_id: str):
+        shutil.rmtree(self.root / session_id, ignore_errors=True)
+        self._locks.pop(session_id, None)
+
+    # Expiry
+
+    def start(self):
+        """Start the expiry sweep on the running event loop"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._sweep_loop())
+
+    async def shutdown(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _sweep_loop(self):
+        while True:
+            try:
+                removed = await self.sweep()
+                if removed:
+                    logger.logger.info(f"Removed {removed} expired upload session(s)")
+            except Exception as e:
+                logger.log_error(e, "Upload session sweep failed")
+            await asyncio.sleep(self.sweep_interval)
+
+    async def sweep(self) -> int:
+        """Delete sessions (and their partial data) not updated within ttl"""
+        if not self.root.exists():
+            return 0
+        cutoff = (datetime.now() - self.ttl).isoformat()
+        removed = 0
+        for session_dir in list(self.root.iterdir()):
+            session_id = session_dir.name
+            async with self._lock(session_id):
+                try:
+                    manifest = self.get(session_id)
+                except (OSError, ValueError):
+                    manifest = None  # torn manifest; judge by directory age
+                updated_at = manifest['updated_at'] if manifest else \
+                    datetime.fromtimestamp(session_dir.stat().st_mtime).isoformat()
+                if updated_at < cutoff:
+                    await run_in_threadpool(self.delete, session_id)
+                    removed += 1
+        return removed
+
+    def _lock(self, session_id: str) -> asyncio.Lock:
+        """Per-session lock; sessions are only mutated from the event loop"""
+        return self._locks.setdefault(session_id, asyncio.Lock())
+
+    def _update(self, session_id: str, manifest: Dict[str, Any], **changes):
+        manifest.update(changes, updated_at=datetime.now().isoformat())
+        self._write_manifest(session_id, manifest)
+
+    def _write_manifest(self, session_id: str, manifest: Dict[str, Any]):
+        """Atomic manifest update (write temp file, fsync, rename)"""
+        path = self.root / session_id / "manifest.json"
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, 'w') as f:
+            json.dump(manifest, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+
+
+# Global upload session store
+upload_sessions = UploadSessionStore(
+    settings.UPLOAD_SESSION_DIR,
+    ttl=timedelta(hours=settings.UPLOAD_SESSION_TTL_HOURS),
+    sweep_interval=settings.UPLOAD_SESSION_SWEEP_SECONDS)
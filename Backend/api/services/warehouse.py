@@ -0,0 +1,311 @@
+import hashlib
+import os
+import threading
+import uuid
+from abc import ABC, abstractmethod
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from config.settings import settings
+
+
+# Natural-key hash of each stored record (see IngestLedger), used to
+# replace a record's stored version when a changed version is ingested
+ROW_KEY_COLUMN = '_row_key'
+
+
+def check_domain(domain: str) -> str:
+    """Normalized domain name; ValueError unless it is a known domain"""
+    name = domain.lower()
+    if name not in settings.DOMAINS:
+        raise ValueError(f"Unknown domain: {domain!r}; expected one of {settings.DOMAINS}")
+    return name
+
+
+class WarehouseBackend(ABC):
+    """
+    Storage interface for ingested (anonymized) department data
+    Backends append bulk frames partitioned by domain and ingest date and
+    serve filtered reads; a BigQuery backend can implement the same API
+    """
+
+    @abstractmethod
+    def append(self, domain: str, df: pd.DataFrame, ingest_date: date = None,
+               part: str = None) -> int:
+        """
+        Append rows to a domain; returns the number of rows written
+        part is a unique name for the written unit, which delete_keys can
+        later be pointed at (generated if omitted)
+        """
+
+    @abstractmethod
+    def read(self, domain: str, columns: List[str] = None,
+             filters: Dict[str, Any] = None, start_date: date = None,
+             end_date: date = None, limit: int = None) -> pd.DataFrame:
+        """
+        Read rows from a domain
+        filters maps column -> value (or list of values); start_date/end_date
+        bound the ingest-date partitions that are scanned
+        """
+
+    @abstractmethod
+    def delete_keys(self, domain: str, key_hashes: np.ndarray,
+                    parts: Iterable[str] = None) -> pd.DataFrame:
+        """
+        Remove stored rows whose ROW_KEY_COLUMN is in key_hashes
+        parts, if given, are the only units searched (None = all of them).
+        Returns the removed rows, so derived aggregates can retract them
+        """
+
+    @abstractmethod
+    def domains(self) -> List[str]:
+        """Domains with stored data"""
+
+    @abstractmethod
+    def fingerprint(self) -> str:
+        """Opaque digest that changes whenever the stored data changes"""
+
+
+class ParquetWarehouse(WarehouseBackend):
+    """
+    Local columnar warehouse: partitioned Parquet files
+    Layout: <root>/<domain>/ingest_date=YYYY-MM-DD/part-<part>.parquet
+    Reads prune partitions by date and push column filters into the
+    Parquet scan (row-group statistics), so only matching data is decoded.
+    Each domain's unified schema is cached and widened by every append,
+    so writes never re-read the footers of stored files
+    """
+
+    _PARTITIONING = ds.partitioning(
+        pa.schema([('ingest_date', pa.string())]), flavor='hive')
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+        self._schemas = {}
+        self._lock = threading.Lock()
+        self._delete_lock = threading.Lock()
+
+    def append(self, domain: str, df: pd.DataFrame, ingest_date: date = None,
+               part: str = None) -> int:
+        if df.empty:
+            return 0
+
+        domain = check_domain(domain)
+        ingest_date = ingest_date or date.today()
+        partition = self.root / domain / f"ingest_date={ingest_date.isoformat()}"
+        partition.mkdir(parents=True, exist_ok=True)
+
+        table = self._conform(domain, self._to_arrow(df))
+        pq.write_table(table, partition / f"part-{part or uuid.uuid4().hex}.parquet",
+                       row_group_size=settings.WAREHOUSE_ROW_GROUP_SIZE)
+
+        with self._lock:
+            cached = self._schemas.get(domain)
+            if cached is not None:
+                stored = cached.remove(cached.get_field_index('ingest_date'))
+                self._schemas[domain] = self._unify([stored, table.schema]) \
+                    .append(pa.field('ingest_date', pa.string()))
+        return table.num_rows
+
+    def read(self, domain: str, columns: List[str] = None,
+             filters: Dict[str, Any] = None, start_date: date = None,
+             end_date: date = None, limit: int = None) -> pd.DataFrame:
+        dataset = self._dataset(domain.lower(), start_date, end_date)
+        if dataset is None:
+            return pd.DataFrame(columns=columns or [])
+
+        available = set(dataset.schema.names)
+        unknown = [c for c in list(columns or []) + list(filters or {})
+                   if c not in available]
+        if unknown:
+            raise ValueError(f"Unknown columns for {domain}: {unknown}")
+
+        expression = None
+        for column, value in (filters or {}).items():
+            if isinstance(value, (list, tuple, set)):
+                term = ds.field(column).isin(list(value))
+            else:
+                term = ds.field(column) == value
+            expression = term if expression is None else expression & term
+
+        if limit is not None:
+            table = dataset.head(limit, columns=columns, filter=expression)
+        else:
+            table = dataset.to_table(columns=columns, filter=expression)
+        return table.to_pandas()
+
+    def delete_keys(self, domain: str, key_hashes: np.ndarray,
+                    parts: Iterable[str] = None) -> pd.DataFrame:
+        """
+        Copy-on-write delete: only files holding one of the keys are
+        rewritten (via a temp file and rename, so concurrent readers see
+        either version). Only the named parts are opened when given;
+        otherwise files are located by scanning the key column alone
+        """
+        domain = check_domain(domain)
+        if len(key_hashes) == 0:
+            return pd.DataFrame()
+
+        domain_dir = self.root / domain
+        if parts is None:
+            paths = sorted(domain_dir.glob("ingest_date=*/*.parquet"))
+        else:
+            names = {f"part-{part}.parquet" for part in parts}
+            paths = [partition / name for partition in sorted(domain_dir.glob("ingest_date=*"))
+                     for name in names if (partition / name).exists()]
+
+        keys = pa.array(np.unique(key_hashes), type=pa.int64())
+        removed = []
+        with self._delete_lock:
+            for path in paths:
+                if not path.exists():
+                    continue  # emptied and removed by a concurrent delete
+                if ROW_KEY_COLUMN not in pq.read_schema(path).names:
+                    continue
+                hits = pc.is_in(pq.read_table(path, columns=[ROW_KEY_COLUMN])[ROW_KEY_COLUMN],
+                                value_set=keys)
+                if not pc.any(hits).as_py():
+                    continue
+
+                table = pq.read_table(path)
+                hits = pc.fill_null(pc.is_in(table[ROW_KEY_COLUMN], value_set=keys), False)
+                removed.append(table.filter(hits).to_pandas())
+                kept = table.filter(pc.invert(hits))
+                if kept.num_rows:
+                    tmp_path = path.with_suffix('.tmp')
+                    pq.write_table(kept, tmp_path,
+                                   row_group_size=settings.WAREHOUSE_ROW_GROUP_SIZE)
+                    os.replace(tmp_path, path)
+                else:
+                    path.unlink()
+
+        # Rewritten files keep their schema, so the cached one stays valid
+        return pd.concat(removed, ignore_index=True) if removed else pd.DataFrame()
+
+    def domains(self) -> List[str]:
+        if not self.root.exists():
+            return []
+        return sorted(p.name for p in self.root.iterdir() if p.is_dir())
+
+    def fingerprint(self) -> str:
+        """Digest of every part file's path, size and modification time"""
+        digest = hashlib.sha256()
+        for path in sorted(self.root.glob("*/ingest_date=*/*.parquet")):
+            stat = path.stat()
+            digest.update(f"{path.relative_to(self.root)}:{stat.st_size}:"
+                          f"{stat.st_mtime_ns}\n".encode())
+        return digest.hexdigest()
+
+    def _dataset(self, domain: str, start_date: Optional[date],
+                 end_date: Optional[date]) -> Optional[ds.Dataset]:
+        domain_dir = self.root / check_domain(domain)
+        if not domain_dir.exists():
+            return None
+
+        # Partition pruning on ingest date before touching any file
+        files = []
+        for partition in sorted(domain_dir.glob("ingest_date=*")):
+            day = date.fromisoformat(partition.name.split("=", 1)[1])
+            if start_date and day < start_date or end_date and day > end_date:
+                continue
+            files.extend(str(f) for f in sorted(partition.glob("*.parquet")))
+        if not files:
+            return None
+
+        return ds.dataset(files, schema=self._schema(domain), format="parquet",
+                          partitioning=self._PARTITIONING,
+                          partition_base_dir=str(domain_dir))
+
+    def _schema(self, domain: str) -> pa.Schema:
+        """Unified schema across every upload stored for a domain (cached)"""
+        with self._lock:
+            schema = self._schemas.get(domain)
+        if schema is not None:
+            return schema
+
+        files = sorted((self.root / domain).glob("ingest_date=*/*.parquet"))
+        schema = self._unify([pq.read_schema(f) for f in files])
+        schema = schema.append(pa.field('ingest_date', pa.string()))
+
+        with self._lock:
+            self._schemas[domain] = schema
+        return schema
+
+    @staticmethod
+    def _unify(schemas: List[pa.Schema]) -> pa.Schema:
+        """
+        Merge partition schemas (numeric widening etc.)
+        A column whose types cannot be merged, e.g. date32 in one upload
+        and string in another, is read as string instead of failing the scan
+        """
+        try:
+            return pa.unify_schemas(schemas, promote_options="permissive")
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            pass
+
+        fields = {}
+        for schema in schemas:
+            for field in schema:
+                fields.setdefault(field.name, []).append(field)
+        merged = []
+        for name, candidates in fields.items():
+            try:
+                merged.append(pa.unify_schemas(
+                    [pa.schema([field]) for field in candidates],
+                    promote_options="permissive").field(0))
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                merged.append(pa.field(name, pa.string()))
+        return pa.schema(merged)
+
+    def _conform(self, domain: str, table: pa.Table) -> pa.Table:
+        """Cast columns the domain already stores to their stored types"""
+        with self._lock:
+            cached = domain in self._schemas
+        if not cached and not any((self.root / domain).glob("ingest_date=*/*.parquet")):
+            return table
+        stored = self._schema(domain)
+
+        columns = []
+        for field, column in zip(table.schema, table.columns):
+            index = stored.get_field_index(field.name)
+            target = stored.field(index).type if index >= 0 else field.type
+            if target != field.type and not pa.types.is_null(target):
+                try:
+                    column = column.cast(target)
+                except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+                    pass  # left as is; _unify reconciles it on read
+            columns.append(column)
+        return pa.table(columns, names=table.column_names)
+
+    @staticmethod
+    def _to_arrow(df: pd.DataFrame) -> pa.Table:
+        """DataFrame -> Arrow, falling back to strings for mixed-type columns"""
+        try:
+            return pa.Table.from_pandas(df, preserve_index=False)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            df = df.copy()
+            for column in df.columns[df.dtypes == object]:
+                df[column] = df[column].astype("string")
+            return pa.Table.from_pandas(df, preserve_index=False)
+
+
+_BACKENDS = {
+    'parquet': ParquetWarehouse,
+}
+
+
+def create_warehouse(backend: str, root: str) -> WarehouseBackend:
+    """Build the configured warehouse backend"""
+    if backend not in _BACKENDS:
+        raise ValueError(f"Unknown warehouse backend: {backend}")
+    return _BACKENDS[backend](root)
+
+
+# Global warehouse instance
+warehouse = create_warehouse(settings.WAREHOUSE_BACKEND, settings.WAREHOUSE_PATH)
@@ -0,0 +1,96 @@
+import atexit
+import json
+import os
+import queue
+import threading
+from pathlib import Path
+from typing import Iterable
+
+
+class BufferedAuditWriter:
+    """
+    Batched, background-flushed JSONL writer for audit trails
+    Entries are queued by callers and appended in arrival order by a single
+    writer thread, which keeps the file open and writes whole batches
+    """
+
+    _STOP = object()
+
+    def __init__(self, path: str, flush_interval: float = 1.0,
+                 max_batch: int = 1000, max_queue: int = 100_000,
+                 fsync: bool = True):
+        self.path = Path(path)
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.fsync = fsync
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = None
+        self._lock = threading.Lock()
+        atexit.register(self.close)
+
+    def write(self, entry: dict):
+        """Queue a single audit entry"""
+        self._ensure_started()
+        self._queue.put(entry)
+
+    def write_many(self, entries: Iterable[dict]):
+        """Queue several audit entries as one contiguous, ordered block"""
+        self._ensure_started()
+        self._queue.put(list(entries))
+
+    def flush(self):
+        """Block until every queued entry has been written to disk"""
+        self._queue.join()
+
+    def close(self):
+        """Flush pending entries and stop the writer thread"""
+        with self._lock:
+            thread, self._thread = self._thread, None
+            if thread is None:
+                return
+            self._queue.put(self._STOP)
+        thread.join()
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._thread = threading.Thread(
+                    target=self._run, name="audit-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        with open(self.path, 'a') as f:
+            stopping = False
+            while not stopping:
+                try:
+                    first = self._queue.get(timeout=self.flush_interval)
+                except queue.Empty:
+                    continue
+
+                batch = [first]
+                while len(batch) < self.max_batch:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+
+                entries = []
+                for item in batch:
+                    if item is self._STOP:
+                        stopping = True
+                    elif isinstance(item, list):
+                        entries.extend(item)
+                    else:
+                        entries.append(item)
+
+                if entries:
+                    f.write(''.join(json.dumps(e) + '\n' for e in entries))
+                    f.flush()
+                    if self.fsync:
+                        os.fsync(f.fileno())
+
+                for _ in batch:
+                    self._queue.task_done()
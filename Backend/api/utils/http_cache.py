@@ -0,0 +1,88 @@
+import hashlib
+import json
+import threading
+from typing import Any, Callable, Dict, Hashable
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from config.settings import settings
+
+
+class CachedPayload:
+    """
+    A versioned, pre-serialized JSON response body with a strong ETag
+    Built once per version; every request for that version reuses the bytes
+    """
+
+    __slots__ = ('version', 'body', 'etag')
+
+    def __init__(self, version: Hashable, body: bytes):
+        self.version = version
+        self.body = body
+        self.etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+    @classmethod
+    def from_json(cls, version: Hashable, payload: Any) -> "CachedPayload":
+        # Same encoding as FastAPI's default JSONResponse
+        body = json.dumps(jsonable_encoder(payload), ensure_ascii=False,
+                          allow_nan=False, separators=(",", ":")).encode("utf-8")
+        return cls(version, body)
+
+
+class SnapshotCache:
+    """Latest CachedPayload per endpoint, rebuilt only when its version changes"""
+
+    def __init__(self):
+        self._entries: Dict[str, CachedPayload] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str, version: Hashable,
+            build: Callable[[], Any]) -> CachedPayload:
+        entry = self._entries.get(key)
+        if entry is not None and entry.version == version:
+            return entry
+
+        entry = CachedPayload.from_json(version, build())
+        with self._lock:
+            self._entries[key] = entry
+        return entry
+
+    def get_bytes(self, key: str, version: Hashable,
+                  build: Callable[[], bytes]) -> CachedPayload:
+        """Like get, for builders that already produce the JSON bytes"""
+        entry = self._entries.get(key)
+        if entry is not None and entry.version == version:
+            return entry
+
+        entry = CachedPayload(version, build())
+        with self._lock:
+            self._entries[key] = entry
+        return entry
+
+
+def cached_response(request: Request, payload: CachedPayload,
+                    max_age: int = None) -> Response:
+    """200 with the cached bytes, or an empty 304 if the client's copy is current"""
+    max_age = settings.HTTP_CACHE_MAX_AGE_SECONDS if max_age is None else max_age
+    headers = {
+        "ETag": payload.etag,
+        "Cache-Control": f"max-age={max_age}, must-revalidate"
+    }
+
+    if _etag_matches(request.headers.get("if-none-match"), payload.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=payload.body, media_type="application/json",
+                    headers=headers)
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match uses weak comparison, so W/ prefixes are ignored"""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+snapshot_cache = SnapshotCache()
@@ -0,0 +1,99 @@
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional
+from utils.logger import logger
+
+
+class PeriodicSnapshot:
+    """
+    In-memory state that a daemon thread snapshots to a JSON file
+    Subclasses mark changes with self._dirty (under self._lock) and
+    implement _snapshot_state, called under the lock, and _restore_state.
+    A snapshot is written atomically (temp file + rename), so a crash
+    leaves either the old or the new one. start() loads the last snapshot
+    through load(), which subclasses may extend
+    """
+
+    # Thread name and the label used in log messages
+    snapshot_name = "snapshot"
+    snapshot_label = "Snapshot"
+
+    def __init__(self, path: str, persist_interval: float):
+        self.path = Path(path)
+        self.persist_interval = persist_interval
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._dirty = False
+
+    def _snapshot_state(self) -> Dict[str, Any]:
+        """JSON-serializable state (called with self._lock held)"""
+        raise NotImplementedError
+
+    def _restore_state(self, state: Dict[str, Any]):
+        """Replace the in-memory state with a loaded snapshot (takes the lock)"""
+        raise NotImplementedError
+
+    def load(self):
+        """Initial state on start(): the last snapshot, if there is one"""
+        self.restore()
+
+    def start(self):
+        """Load the initial state and start periodic persistence"""
+        self.load()
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name=self.snapshot_name, daemon=True)
+            self._thread.start()
+
+    def shutdown(self):
+        """Stop the persistence thread and write a final snapshot"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        self.persist()
+
+    def _run(self):
+        while not self._stop.wait(self.persist_interval):
+            try:
+                self.persist()
+            except Exception as e:
+                logger.log_error(e, f"{self.snapshot_label} persist failed")
+
+    def persist(self):
+        """Atomically write the state to disk if it changed"""
+        with self._lock:
+            if not self._dirty:
+                return
+            state = {'saved_at': datetime.now().isoformat(), **self._snapshot_state()}
+            self._dirty = False
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.path)
+
+    def read_snapshot(self) -> Optional[Dict[str, Any]]:
+        """The last snapshot on disk, or None if missing or unreadable"""
+        if not self.path.exists():
+            return None
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.log_error(e, f"{self.snapshot_label} snapshot unreadable")
+            return None
+
+    def restore(self) -> bool:
+        """Load the last snapshot; False if there is none to load"""
+        state = self.read_snapshot()
+        if state is None:
+            return False
+        self._restore_state(state)
+        return True
@@ -0,0 +1,105 @@
+# benchmark_history_store.py
+"""
+Benchmark memory use and lookup latency of the compact history store
+against plain pandas DataFrames, on data/raw department data replicated
+to a target row count
+Run from Backend/scripts:  python benchmark_history_store.py [rows]
+"""
+import os
+import sys
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'api'))
+os.chdir(os.path.join(os.path.dirname(__file__), '..', 'api'))
+
+from config.settings import settings  # noqa: E402
+from services.history_store import DomainHistory  # noqa: E402
+
+LOOKUPS = 200
+
+
+def build_history(path, num_rows):
+    """Department rows replicated to num_rows, years shifted so dates stay distinct"""
+    base = pd.read_csv(path)
+    reps = int(np.ceil(num_rows / len(base)))
+    timestamps = pd.to_datetime(base['timestamp'])
+    copies = [base.assign(timestamp=(timestamps - pd.DateOffset(years=2 * i))
+                          .dt.strftime('%Y-%m-%d'))
+              for i in range(reps)]
+    return pd.concat(copies, ignore_index=True).iloc[:num_rows]
+
+
+def pick_queries(df, count):
+    """Random (district, service_type, start, end) lookups over ~3 months"""
+    rng = np.random.default_rng(42)
+    pairs = df[['district', 'service_type']].drop_duplicates().to_numpy()
+    days = pd.to_datetime(df['timestamp'])
+    first, last = days.min(), days.max()
+    queries = []
+    for district, service_type in pairs[rng.integers(0, len(pairs), count)]:
+        start = first + pd.Timedelta(days=int(rng.integers(0, (last - first).days)))
+        queries.append((district, service_type, start.date(),
+                        (start + pd.Timedelta(days=90)).date()))
+    return queries
+
+
+def pandas_lookup(df, district, service_type, start, end):
+    """Plain boolean-mask filter, as a handler holding the DataFrame would do it"""
+    mask = (df['district'] == district) & (df['service_type'] == service_type) & \
+        (df['timestamp'] >= start.isoformat()) & (df['timestamp'] <= end.isoformat())
+    return df[mask]
+
+
+def time_lookups(label, lookup, queries):
+    start = time.perf_counter()
+    rows = sum(len(lookup(*query)) for query in queries)
+    elapsed = (time.perf_counter() - start) / len(queries)
+    print(f"   {label:<28} {elapsed * 1000:9.3f} ms/lookup")
+    return elapsed, rows
+
+
+if __name__ == "__main__":
+    num_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+    print("\n" + "="*70)
+    print(f"🗄️  HISTORY STORE BENCHMARK - {num_rows:,} rows per domain")
+    print("="*70 + "\n")
+
+    for domain, path in settings.DOMAIN_DATA_PATHS.items():
+        df = build_history(path, num_rows)
+        pandas_mb = df.memory_usage(deep=True).sum() / 1e6
+
+        start = time.perf_counter()
+        history = DomainHistory.from_frame(df)
+        build_elapsed = time.perf_counter() - start
+        store_mb = history.nbytes / 1e6
+
+        print(f"📊 {domain} ({len(df):,} rows, {len(df.columns)} columns)")
+        print(f"   {'pandas (object columns)':<28} {pandas_mb:9.1f} MB")
+        print(f"   {'compact store':<28} {store_mb:9.1f} MB  "
+              f"x{pandas_mb / store_mb:.1f} smaller, built in {build_elapsed:.2f}s")
+
+        queries = pick_queries(df, LOOKUPS)
+        pandas_elapsed, pandas_rows = time_lookups(
+            "pandas boolean mask", lambda *q: pandas_lookup(df, *q), queries)
+        store_elapsed, store_rows = time_lookups(
+            "compact store (decoded)", history.lookup, queries)
+        time_lookups("compact store (row range)", lambda *q: history.columns[
+            'timestamp'][history.row_range(*q)], queries)
+        assert store_rows == pandas_rows, \
+            f"store returned {store_rows} rows, pandas {pandas_rows}"
+        print(f"   {'':<28} speedup x{pandas_elapsed / store_elapsed:.0f}")
+
+        # Same lookups on memory-mapped columns (what each worker would open)
+        with tempfile.TemporaryDirectory() as tmp:
+            history.save(tmp)
+            mapped = DomainHistory.open(tmp)
+            time_lookups("memory-mapped store", mapped.lookup, queries)
+            del mapped
+        print()
+
+    print("✅ Store lookups return the same rows as pandas")
+    print("="*70 + "\n")
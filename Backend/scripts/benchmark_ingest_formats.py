@@ -0,0 +1,90 @@
+# benchmark_ingest_formats.py
+"""
+Benchmark upload ingest speed per file format (Excel, CSV, Parquet, Arrow)
+on the data/raw/maharashtra_*_data.csv department files
+Run from Backend/scripts:  python benchmark_ingest_formats.py
+"""
+import os
+import sys
+import tempfile
+import time
+from unittest import mock
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'api'))
+os.chdir(os.path.join(os.path.dirname(__file__), '..', 'api'))
+
+import services.ingest_service as ingest_service  # noqa: E402
+from services.ingest_service import IngestService  # noqa: E402
+from services.ingest_ledger import IngestLedger  # noqa: E402
+from services.trend_rollups import TrendRollups  # noqa: E402
+from services.warehouse import ParquetWarehouse  # noqa: E402
+
+DATASETS = ['health', 'infrastructure', 'public_safety']
+
+
+def write_formats(df, directory, name):
+    """Write one dataset in every supported upload format"""
+    paths = {
+        'csv': os.path.join(directory, f'{name}.csv'),
+        'excel': os.path.join(directory, f'{name}.xlsx'),
+        'parquet': os.path.join(directory, f'{name}.parquet'),
+        'arrow': os.path.join(directory, f'{name}.arrow'),
+    }
+    df.to_csv(paths['csv'], index=False)
+    df.to_excel(paths['excel'], index=False)
+    df.to_parquet(paths['parquet'], index=False)
+    feather.write_feather(pa.Table.from_pandas(df, preserve_index=False),
+                          paths['arrow'], compression='uncompressed')
+    return paths
+
+
+def time_ingest(path, filename, domain):
+    """
+    Parse, anonymize and store a file through the upload pipeline, into a
+    throwaway warehouse, ledger and rollups so every format starts from
+    empty stores and the real ones are never touched
+    Returns (seconds, rows processed, rows skipped)
+    """
+    with tempfile.TemporaryDirectory() as store:
+        with mock.patch.multiple(
+                ingest_service,
+                warehouse=ParquetWarehouse(os.path.join(store, 'warehouse')),
+                ingest_ledger=IngestLedger(os.path.join(store, 'ingest_ledger.db')),
+                trend_rollups=TrendRollups(os.path.join(store, 'trend_rollups.json'),
+                                           persist_interval=0)):
+            start = time.perf_counter()
+            with open(path, 'rb') as f:
+                fmt = IngestService.detect_format(f, filename)
+                summary = IngestService.ingest(IngestService.iter_chunks(f, fmt), domain)
+            elapsed = time.perf_counter() - start
+    return elapsed, summary['records_processed'], summary['rows_skipped']
+
+
+if __name__ == "__main__":
+    print("\n" + "="*70)
+    print("📂 INGEST FORMAT BENCHMARK")
+    print("="*70 + "\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in DATASETS:
+            df = pd.read_csv(f'../data/raw/maharashtra_{name}_data.csv')
+            paths = write_formats(df, tmp, name)
+
+            print(f"📊 {name} ({len(df):,} rows)")
+            baseline = None
+            for fmt in ['excel', 'csv', 'parquet', 'arrow']:
+                size_kb = os.path.getsize(paths[fmt]) / 1024
+                elapsed, rows, skipped = time_ingest(
+                    paths[fmt], os.path.basename(paths[fmt]), name)
+                assert rows + skipped == len(df), \
+                    f"{fmt}: expected {len(df)} rows, got {rows} ingested + {skipped} skipped"
+                baseline = baseline or elapsed
+                print(f"   {fmt:<8} {size_kb:9.1f} KB {elapsed:8.3f}s "
+                      f"{len(df) / elapsed:12,.0f} rows/s  x{baseline / elapsed:.1f}"
+                      f"  ({skipped:,} duplicate rows skipped)")
+            print()
+
+    print("="*70 + "\n")